@@ -3,13 +3,18 @@
 """This is a simple bubble game where the player needs to click on the bubbles to score points.
 The game requires use of amouse or mousepad to click on the bubbles.
 The player will lose 1 point for each bubble that expires. 
-The game is timed and the player needs to score 20 points before the 40 second timer runs out to win the game."""
+The game is timed and the player needs to score 20 points before the 40 second timer runs out to win the game.
+Press S on the start screen for swarm mode: hundreds of moving bubbles, no penalty for expiry, higher target."""
 
 import pygame
 import sys
 import random
 import math
-import wave, struct
+import wave
+import json
+import time
+import numpy as np
+from collections import OrderedDict
 from pathlib import Path
 
 # ---------- Config ----------
@@ -53,28 +58,171 @@ GOLD_LIFETIME_FACTOR = 0.70  # golden bubbles live 70% of normal lifetime
 GOLD_SPEED_MIN = 120
 GOLD_SPEED_MAX = 220
 
+# ---------- Swarm mode config ----------
+SWARM_TARGET_SCORE = 150
+SWARM_COUNT_BASE = 150            # live bubbles wanted at the start of a swarm session
+SWARM_COUNT_END = 1200            # ... and by the end of it
+SWARM_CAPACITY = 2000
+SWARM_SPAWN_PER_FRAME = 40        # top-up limit so the field fills over a few frames
+SWARM_LIFETIME_FACTOR = 3.0       # swarm bubbles live longer; expiring ones cost nothing
+SWARM_SPEED_MIN = 30
+SWARM_SPEED_MAX = 90
+
 # ---------- Pop effect config ----------
 POPEFFECT_MS = 250
 POPEFFECT_MAX_R_GROW = 24
+POPEFFECT_FRAMES = 16               # pre-rendered frames per pop (about one per 60 FPS frame)
+POPEFFECT_CACHE_BYTES = 8 * 1024 * 1024  # evict the oldest frames beyond this much pixel data
+POPEFFECT_POOL_SIZE = 64            # max simultaneous pops; the oldest is recycled beyond this
 
 # ---------- Sound ----------
 ASSET_DIR = Path(__file__).parent
-CHIME_WAV = ASSET_DIR / "chime.wav"
+CHIME_CACHE_DIR = None        # set to e.g. ASSET_DIR to keep synthesized chimes on disk
+CHIME_FREQ_BASE = 880.0       # pitch of a normal (1 point) bubble
+CHIME_SEMITONES_PER_POINT = 3.5  # each extra point raises the chime (gold = +7, a fifth)
 
-def generate_chime_if_needed(path: Path, frequency=880.0, duration_ms=140, volume=0.45, samplerate=44100):
-    if path.exists():
-        return
+def synth_chime(frequency=880.0, duration_ms=140, volume=0.45, samplerate=44100, attack_ms=0):
+    """Build a whole chime (sine * envelope) as one int16 NumPy array."""
     nframes = int(samplerate * (duration_ms / 1000.0))
-    amp = int(32767 * max(0.0, min(volume, 1.0)))
+    amp = 32767 * max(0.0, min(volume, 1.0))
+    i = np.arange(nframes)
+    envelope = 1.0 - (i / nframes)  # linear fade out
+    attack = int(samplerate * (attack_ms / 1000.0))
+    if attack > 0:
+        envelope[:attack] *= i[:attack] / attack  # short fade in to avoid a click
+    wave_data = np.sin(2 * np.pi * frequency * (i / samplerate))
+    return (amp * envelope * wave_data).astype(np.int16)
+
+def write_wav(path: Path, samples, samplerate=44100):
+    """Write mono int16 samples to a WAV file in a single call."""
     with wave.open(str(path), "w") as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(samplerate)
-        for i in range(nframes):
-            t = i / samplerate
-            fade = 1.0 - (i / nframes)
-            sample = int(amp * fade * math.sin(2 * math.pi * frequency * t))
-            wf.writeframes(struct.pack("<h", sample))
+        wf.writeframes(samples.astype("<i2").tobytes())
+
+def read_wav(path: Path):
+    with wave.open(str(path), "r") as wf:
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+
+def chime_frequency(value):
+    """Higher-value bubbles get a higher-pitched chime."""
+    return CHIME_FREQ_BASE * 2 ** ((int(value) - 1) * CHIME_SEMITONES_PER_POINT / 12.0)
+
+def make_chime(frequency=880.0, duration_ms=140, volume=0.45, cache_dir=None):
+    """Synthesize a chime and hand it straight to the mixer (no disk round-trip needed).
+
+    If cache_dir is given the samples are also kept there as a WAV and reused next time.
+    Requires pygame.mixer to be initialized (its format decides rate and channels).
+    """
+    samplerate, _, channels = pygame.mixer.get_init()
+    path = None
+    if cache_dir is not None:
+        path = Path(cache_dir) / f"chime_{frequency:.0f}hz_{duration_ms}ms_v{volume:.2f}_{samplerate}.wav"
+
+    if path is not None and path.exists():
+        samples = read_wav(path)
+    else:
+        samples = synth_chime(frequency, duration_ms, volume, samplerate)
+        if path is not None:
+            try:
+                write_wav(path, samples, samplerate)
+            except OSError:
+                pass  # caching is optional; a read-only folder is fine
+
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+def build_chimes(values, cache_dir=None):
+    """Pre-build one chime per bubble value so playing a pop never synthesizes mid-game."""
+    return {int(v): make_chime(chime_frequency(v), cache_dir=cache_dir) for v in values}
+
+def play_chime(chimes, value):
+    if value not in chimes:
+        chimes.update(build_chimes((value,), cache_dir=CHIME_CACHE_DIR))
+    chimes[value].play()
+
+# ---------- Latency ----------
+LATENCY_LOG = None   # set to e.g. ASSET_DIR / "latency.jsonl" to log click-to-photon latency per session
+LATENCY_BUCKET_MS = 1  # histogram bucket width
+
+def latency_stats(samples_ns):
+    """p50/p95/p99/max (ms) plus a histogram {bucket_start_ms: count} for a list of ns samples."""
+    if not samples_ns:
+        return {"count": 0}
+    ordered = sorted(samples_ns)
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))] / 1e6
+    histogram = {}
+    for ns in ordered:
+        bucket = int(ns / 1e6 // LATENCY_BUCKET_MS) * LATENCY_BUCKET_MS
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    return {
+        "count": len(ordered),
+        "p50_ms": round(pct(50), 3),
+        "p95_ms": round(pct(95), 3),
+        "p99_ms": round(pct(99), 3),
+        "max_ms": round(ordered[-1] / 1e6, 3),
+        "histogram_ms": histogram,
+    }
+
+class LatencyProbe:
+    """Click-to-photon timing with time.perf_counter_ns.
+
+    click()     - a MOUSEBUTTONDOWN has just been taken off the event queue
+    resolved()  - the hit test for that click has answered
+    flipped()   - pygame.display.flip() has returned; every hit resolved before it
+                  now has its PopEffect on screen
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.input_to_hit = []
+        self.hit_to_flip = []
+        self.input_to_flip = []
+        self._click_ns = None
+        self._pending = []  # (click_ns, hit_ns) waiting for their first flip
+
+    def click(self):
+        self._click_ns = time.perf_counter_ns()
+
+    def resolved(self, hit):
+        if self._click_ns is None:
+            return
+        now = time.perf_counter_ns()
+        self.input_to_hit.append(now - self._click_ns)
+        if hit:
+            self._pending.append((self._click_ns, now))
+        self._click_ns = None
+
+    def flipped(self):
+        if not self._pending:
+            return
+        now = time.perf_counter_ns()
+        for click_ns, hit_ns in self._pending:
+            self.hit_to_flip.append(now - hit_ns)
+            self.input_to_flip.append(now - click_ns)
+        self._pending.clear()
+
+    def summary(self):
+        return {
+            "input_to_hit": latency_stats(self.input_to_hit),
+            "hit_to_flip": latency_stats(self.hit_to_flip),
+            "input_to_flip": latency_stats(self.input_to_flip),
+        }
+
+    def write(self, path, **session_info):
+        """Append this session's summary as one JSON line; does nothing if no clicks were seen."""
+        if path is None or not self.input_to_hit:
+            return
+        record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), **session_info, **self.summary()}
+        try:
+            with open(path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Could not write latency log '{path}': {e}")
 
 # ---------- Text Helpers ----------
 def draw_text(surface, text, size, color, x, y, center=True, bold=True):
@@ -95,19 +243,138 @@ def lerp(a, b, t):
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
+# ---------- Game Clock ----------
+class RealTimeClock:
+    """Game time in milliseconds, straight from pygame's tick counter."""
+    def now(self):
+        return pygame.time.get_ticks()
+
+    def tick(self):
+        pass  # real time advances by itself
+
+class PausableClock:
+    """Wraps another clock; game time stands still between pause() and resume()."""
+    def __init__(self, source=None):
+        self.source = source if source is not None else RealTimeClock()
+        self.offset = 0
+        self.paused_at = None
+
+    @property
+    def paused(self):
+        return self.paused_at is not None
+
+    def now(self):
+        if self.paused_at is not None:
+            return self.paused_at
+        return self.source.now() - self.offset
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = self.now()
+
+    def resume(self):
+        if self.paused_at is not None:
+            self.offset = self.source.now() - self.paused_at
+            self.paused_at = None
+
+    def tick(self):
+        self.source.tick()
+
+class FixedStepClock:
+    """Deterministic clock: advances exactly step_ms per tick(), whatever the wall time.
+
+    Use it for headless runs, frame stepping and benchmarks (main(FixedStepClock(), fps=0)
+    runs as fast as the machine allows while the game still sees 60 FPS steps).
+    """
+    def __init__(self, step_ms=1000.0 / FPS, start_ms=0):
+        self.step_ms = step_ms
+        self.t = float(start_ms)
+
+    def now(self):
+        return int(self.t)
+
+    def tick(self):
+        self.t += self.step_ms
+
+    def advance(self, ms):
+        self.t += ms
+
+    def seek(self, t_ms):
+        """Jump to an absolute time (event-driven simulation)."""
+        self.t = float(t_ms)
+
+DEFAULT_CLOCK = RealTimeClock()
+
+# ---------- Object Pool ----------
+class ObjectPool:
+    """Fixed-capacity pool that recycles instances in place instead of allocating new ones.
+
+    items[:live] are in use. acquire() hands out the next free instance (or recycles the
+    oldest live one when full); the caller fills it with reset(...). sweep() and release()
+    compact the live items to the front by swapping, so nothing is allocated per frame.
+    """
+    def __init__(self, cls, capacity):
+        self.items = [cls.__new__(cls) for _ in range(capacity)]  # blank; filled by reset()
+        self.live = 0
+
+    def __len__(self):
+        return self.live
+
+    def __iter__(self):
+        items = self.items
+        for i in range(self.live):
+            yield items[i]
+
+    def acquire(self):
+        if self.live < len(self.items):
+            item = self.items[self.live]
+            self.live += 1
+            return item
+        item = self.items.pop(0)  # full: recycle the oldest
+        self.items.append(item)
+        return item
+
+    def release(self, item):
+        items = self.items
+        i = items.index(item, 0, self.live)
+        items.append(items.pop(i))  # keep the remaining live items in order
+        self.live -= 1
+
+    def sweep(self, now_ms):
+        """Keep only items whose alive(now_ms) is true (order preserved)."""
+        items = self.items
+        j = 0
+        for i in range(self.live):
+            item = items[i]
+            if item.alive(now_ms):
+                if i != j:
+                    items[i], items[j] = items[j], item
+                j += 1
+        self.live = j
+
+    def clear(self):
+        self.live = 0
+
 # ---------- Bubble Object ----------
 class Bubble:
-    def __init__(self, width, height, min_r, max_r, lifetime_ms, color, value, vx=0.0, vy=0.0):
+    __slots__ = ("radius", "x", "y", "born_at", "lifetime_ms", "color", "value", "vx", "vy")
+
+    def __init__(self, width, height, min_r, max_r, lifetime_ms, color, value, vx=0.0, vy=0.0, clock=None):
+        self.reset(width, height, min_r, max_r, lifetime_ms, color, value, vx, vy, clock)
+
+    def reset(self, width, height, min_r, max_r, lifetime_ms, color, value, vx=0.0, vy=0.0, clock=None):
+        """(Re)initialize in place so pooled bubbles can be reused."""
         self.radius = random.randint(int(min_r), int(max_r))
         margin = self.radius + 8
         self.x = random.randint(margin, width - margin)
         self.y = random.randint(100 + margin, height - margin)
-        self.born_at = pygame.time.get_ticks()
+        self.born_at = (clock or DEFAULT_CLOCK).now()
         self.lifetime_ms = int(lifetime_ms)
         self.color = color
         self.value = int(value)
         self.vx = float(vx)
         self.vy = float(vy)
+        return self
 
     def is_hit(self, pos):
         dx = pos[0] - self.x
@@ -151,36 +418,92 @@ class Bubble:
             highlight_r, width=2
         )
 
+# ---------- PopEffect Frame Cache ----------
+class PopFrameCache:
+    """Pre-rendered pop ring frames keyed by (base radius, color, frame index).
+
+    Frames are rendered the first time they are needed and then reused, so drawing a
+    pop is one blit. The least recently used frames are evicted once the cached pixel
+    data grows past max_bytes.
+    """
+    def __init__(self, frames=POPEFFECT_FRAMES, max_bytes=POPEFFECT_CACHE_BYTES):
+        self.frames = frames
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._cache = OrderedDict()
+
+    def frame_index(self, age_ms):
+        t = min(1.0, max(0.0, age_ms / POPEFFECT_MS))
+        return min(self.frames - 1, int(t * self.frames))
+
+    def get(self, base_r, color, index):
+        key = (base_r, color, index)
+        frame = self._cache.get(key)
+        if frame is not None:
+            self._cache.move_to_end(key)
+            return frame
+
+        frame = self._render(base_r, color, index)
+        self._cache[key] = frame
+        self.size_bytes += frame.get_width() * frame.get_height() * 4
+        while self.size_bytes > self.max_bytes and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self.size_bytes -= old.get_width() * old.get_height() * 4
+        return frame
+
+    def _render(self, base_r, color, index):
+        t = index / float(self.frames - 1)
+        r = int(base_r + t * POPEFFECT_MAX_R_GROW)
+        alpha_outline = int(255 * (1.0 - t))
+        alpha_fill = int(90 * (1.0 - t))
+        ring = pygame.Surface((r * 2 + 6, r * 2 + 6), pygame.SRCALPHA)
+        center = (r + 3, r + 3)
+        pygame.draw.circle(ring, (*color, alpha_fill), center, max(1, r - 3))
+        pygame.draw.circle(ring, (*color, alpha_outline), center, r, width=5)
+        return ring
+
+POP_FRAMES = PopFrameCache()
+
 # ---------- PopEffect Object ----------
 class PopEffect:
-    def __init__(self, x, y, base_radius, color):
+    __slots__ = ("x", "y", "base_r", "color", "born")
+
+    def __init__(self, x, y, base_radius, color, clock=None):
+        self.reset(x, y, base_radius, color, clock)
+
+    def reset(self, x, y, base_radius, color, clock=None):
+        """(Re)initialize in place so pooled effects can be reused."""
         self.x = x
         self.y = y
         self.base_r = base_radius
         self.color = color
-        self.born = pygame.time.get_ticks()
+        self.born = (clock or DEFAULT_CLOCK).now()
+        return self
 
     def alive(self, now_ms):
         return (now_ms - self.born) < POPEFFECT_MS
 
-    def draw(self, surface, now_ms):
-        age = now_ms - self.born
-        t = min(1.0, max(0.0, age / POPEFFECT_MS))
-        r = int(self.base_r + t * POPEFFECT_MAX_R_GROW)
-        alpha_outline = int(255 * (1.0 - t))
-        alpha_fill = int(90 * (1.0 - t))
-        ring = pygame.Surface((r * 2 + 6, r * 2 + 6), pygame.SRCALPHA)
-        center = (r + 3, r + 3)
-        pygame.draw.circle(ring, (*self.color, alpha_fill), center, max(1, r - 3))
-        pygame.draw.circle(ring, (*self.color, alpha_outline), center, r, width=5)
-        surface.blit(ring, (self.x - r - 3, self.y - r - 3))
+    def draw(self, surface, now_ms, frames=POP_FRAMES):
+        ring = frames.get(self.base_r, self.color, frames.frame_index(now_ms - self.born))
+        half = ring.get_width() // 2
+        surface.blit(ring, (self.x - half, self.y - half))
+
+def session_progress(time_left, session_seconds):
+    """0.0 at the start of a session, 1.0 when the timer runs out."""
+    return 1.0 - clamp(time_left / float(session_seconds), 0.0, 1.0)
 
-def spawn_bubble(time_left, session_seconds):
-    """Spawn a bubble whose size/lifetime are based on current difficulty; sometimes golden."""
-    progress = 1.0 - clamp(time_left / float(session_seconds), 0.0, 1.0)
+def difficulty_ramp(time_left, session_seconds):
+    """Return (min_r, max_r, lifetime_ms) for the current point in the session."""
+    progress = session_progress(time_left, session_seconds)
     min_r = lerp(BUBBLE_MIN_RADIUS_BASE, BUBBLE_MIN_RADIUS_END, progress)
     max_r = lerp(BUBBLE_MAX_RADIUS_BASE, BUBBLE_MAX_RADIUS_END, progress)
     lifetime_ms = lerp(BUBBLE_LIFETIME_MS_BASE, BUBBLE_LIFETIME_MS_END, progress)
+    return min_r, max_r, lifetime_ms
+
+def spawn_bubble(time_left, session_seconds, clock=None, out=None):
+    """Spawn a bubble whose size/lifetime are based on current difficulty; sometimes golden.
+    If out is given (e.g. from an ObjectPool) it is reset in place instead of allocating."""
+    min_r, max_r, lifetime_ms = difficulty_ramp(time_left, session_seconds)
 
     if random.random() < GOLD_CHANCE:
         color = GOLD_COLOR
@@ -196,68 +519,235 @@ def spawn_bubble(time_left, session_seconds):
         vx = 0.0
         vy = 0.0
 
-    return Bubble(WIDTH, HEIGHT, min_r, max_r, lifetime_ms, color, value, vx, vy)
+    if out is not None:
+        return out.reset(WIDTH, HEIGHT, min_r, max_r, lifetime_ms, color, value, vx, vy, clock)
+    return Bubble(WIDTH, HEIGHT, min_r, max_r, lifetime_ms, color, value, vx, vy, clock=clock)
 
 def current_spawn_gap_ms(time_left, session_seconds):
     """Compute spawn gap ramp."""
-    progress = 1.0 - clamp(time_left / float(session_seconds), 0.0, 1.0)
+    progress = session_progress(time_left, session_seconds)
     return int(lerp(SPAWN_GAP_MS_BASE, SPAWN_GAP_MS_END, progress))
 
+# ---------- Swarm BubbleField ----------
+class BubbleField:
+    """Many bubbles stored as NumPy columns (struct-of-arrays) for swarm mode.
+
+    Rows [0, n) are live. Movement, wall bounce, expiry and hit testing each run as
+    one vectorized pass over the columns instead of a Python loop over objects.
+    """
+    def __init__(self, capacity=SWARM_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.n = 0
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.radius = np.zeros(capacity, dtype=np.int32)
+        self.born_at = np.zeros(capacity, dtype=np.int64)
+        self.lifetime = np.zeros(capacity, dtype=np.int64)
+        self.value = np.zeros(capacity, dtype=np.int32)
+        self._sprites = {}
+
+    def columns(self):
+        return (self.x, self.y, self.vx, self.vy, self.radius, self.born_at, self.lifetime, self.value)
+
+    def clear(self):
+        self.n = 0
+
+    def spawn(self, count, now_ms, time_left, session_seconds, width=WIDTH, height=HEIGHT):
+        """Append up to count new bubbles (same ramps as spawn_bubble). Returns how many were added."""
+        count = min(int(count), self.capacity - self.n)
+        if count <= 0:
+            return 0
+        min_r, max_r, lifetime_ms = difficulty_ramp(time_left, session_seconds)
+        rng = self.rng
+        gold = rng.random(count) < GOLD_CHANCE
+
+        radius = rng.integers(int(min_r), int(max_r) + 1, size=count)
+        margin = radius + 8
+        angle = rng.uniform(0, 2 * math.pi, size=count)
+        speed = np.where(gold,
+                         rng.uniform(GOLD_SPEED_MIN, GOLD_SPEED_MAX, size=count),
+                         rng.uniform(SWARM_SPEED_MIN, SWARM_SPEED_MAX, size=count))
+        lifetime = lifetime_ms * SWARM_LIFETIME_FACTOR * np.where(gold, GOLD_LIFETIME_FACTOR, 1.0)
+
+        s = slice(self.n, self.n + count)
+        self.radius[s] = radius
+        self.x[s] = rng.integers(margin, width - margin + 1)
+        self.y[s] = rng.integers(100 + margin, height - margin + 1)
+        self.vx[s] = np.cos(angle) * speed
+        self.vy[s] = np.sin(angle) * speed
+        self.born_at[s] = now_ms
+        self.lifetime[s] = lifetime.astype(np.int64)
+        self.value[s] = np.where(gold, GOLD_SCORE, 1)
+        self.n += count
+        return count
+
+    def move_and_bounce(self, dt_ms, width, height):
+        n = self.n
+        if n == 0:
+            return
+        dt = dt_ms / 1000.0
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        x += vx * dt
+        y += vy * dt
+
+        margin = self.radius[:n] + 8
+        left, right = margin, width - margin
+        top, bottom = 100 + margin, height - margin  # keep out of HUD
+
+        out_x = (x < left) | (x > right)
+        out_y = (y < top) | (y > bottom)
+        np.clip(x, left, right, out=x)
+        np.clip(y, top, bottom, out=y)
+        vx[out_x] *= -1
+        vy[out_y] *= -1
+
+    def expire(self, now_ms):
+        """Drop every expired bubble in one pass; returns how many expired."""
+        n = self.n
+        keep = (now_ms - self.born_at[:n]) < self.lifetime[:n]
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return 0
+        for col in self.columns():
+            col[:kept] = col[:n][keep]
+        self.n = kept
+        return n - kept
+
+    def hit_index(self, pos):
+        """Index of the top-most (last drawn) bubble under pos, or -1."""
+        n = self.n
+        dx = self.x[:n] - pos[0]
+        dy = self.y[:n] - pos[1]
+        r = self.radius[:n]
+        hits = np.flatnonzero(dx * dx + dy * dy <= r * r)
+        return int(hits[-1]) if hits.size else -1
+
+    def pop(self, i):
+        """Remove bubble i and return (x, y, radius, value) for scoring and effects."""
+        n = self.n
+        popped = (int(self.x[i]), int(self.y[i]), int(self.radius[i]), int(self.value[i]))
+        for col in self.columns():
+            col[i:n - 1] = col[i + 1:n]
+        self.n = n - 1
+        return popped
+
+    def _sprite(self, radius, color):
+        key = (radius, color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+            c = radius + 1
+            pygame.draw.circle(sprite, color, (c, c), radius, width=3)
+            pygame.draw.circle(sprite, (200, 240, 255), (c - radius // 3, c - radius // 3),
+                               max(3, radius // 4), width=2)
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface):
+        n = self.n
+        xs = self.x[:n].astype(np.int32).tolist()
+        ys = self.y[:n].astype(np.int32).tolist()
+        batch = []
+        for x, y, r, v in zip(xs, ys, self.radius[:n].tolist(), self.value[:n].tolist()):
+            color = GOLD_COLOR if v == GOLD_SCORE else CYAN
+            batch.append((self._sprite(r, color), (x - r - 1, y - r - 1)))
+        surface.blits(batch, doreturn=False)
+
 # ---------- Main ----------
-def main():
+def main(game_clock=None, fps=FPS, latency_log=LATENCY_LOG):
+    """Run the game. game_clock drives all game time (pass a FixedStepClock and fps=0
+    to fast-forward deterministically); it is wrapped so pausing freezes it.
+    If latency_log is a path, click-to-photon latency is appended there after each session."""
     pygame.init()
     pygame.mixer.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Bubbles — Target/Click")
     clock = pygame.time.Clock()
+    game_clock = PausableClock(game_clock)
 
-    generate_chime_if_needed(CHIME_WAV)
-    chime = pygame.mixer.Sound(str(CHIME_WAV))
+    chimes = build_chimes((1, GOLD_SCORE), cache_dir=CHIME_CACHE_DIR)
 
     mode = "START"  # START, PLAYING, PAUSED, GAME_OVER
+    swarm = False   # swarm mode: many moving bubbles at once, held in a BubbleField
     score = 0
     time_left = float(SESSION_SECONDS)
     won = False
+    target_score = TARGET_SCORE
 
     bubble = None
+    bubbles = ObjectPool(Bubble, 1)
+    field = BubbleField()
+    latency = LatencyProbe()
+    session_ended = False
     next_spawn_at = 0
-    effects = []
+    effects = ObjectPool(PopEffect, POPEFFECT_POOL_SIZE)
 
+    last_now = game_clock.now()
     running = True
     while running:
-        dt_ms = clock.tick(FPS)
+        clock.tick(fps)
+        game_clock.tick()
+        now = game_clock.now()
+        dt_ms = now - last_now  # zero while paused
+        last_now = now
 
         # Events
         for event in pygame.event.get():
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                latency.click()
+
             if event.type == pygame.QUIT:
                 running = False
+                if mode in ("PLAYING", "PAUSED"):
+                    latency.write(latency_log, mode="swarm" if swarm else "classic", score=score, finished=False)
 
             if mode == "START":
-                if event.type == pygame.KEYDOWN and event.key in (pygame.K_SPACE, pygame.K_RETURN):
+                if event.type == pygame.KEYDOWN and event.key in (pygame.K_SPACE, pygame.K_RETURN, pygame.K_s):
                     mode = "PLAYING"
+                    swarm = event.key == pygame.K_s
+                    target_score = SWARM_TARGET_SCORE if swarm else TARGET_SCORE
                     score = 0
                     time_left = float(SESSION_SECONDS)
                     won = False
-                    bubble = spawn_bubble(time_left, SESSION_SECONDS)
+                    field.clear()
+                    bubbles.clear()
+                    bubble = None if swarm else spawn_bubble(time_left, SESSION_SECONDS, game_clock, bubbles.acquire())
                     next_spawn_at = 0
-                    effects = []
+                    effects.clear()
+                    latency.reset()
 
             elif mode == "PLAYING":
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
                     mode = "PAUSED"
-
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if bubble is not None and bubble.is_hit(event.pos):
+                    game_clock.pause()
+
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and swarm:
+                    idx = field.hit_index(event.pos)
+                    latency.resolved(idx >= 0)
+                    if idx >= 0:
+                        x, y, radius, value = field.pop(idx)
+                        score += value
+                        play_chime(chimes, value)
+                        effects.acquire().reset(x, y, radius, GOLD_COLOR if value == GOLD_SCORE else CYAN, game_clock)
+
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    hit = bubble is not None and bubble.is_hit(event.pos)
+                    latency.resolved(hit)
+                    if hit:
                         score += bubble.value
-                        chime.play()
-                        effects.append(PopEffect(int(bubble.x), int(bubble.y), bubble.radius, bubble.color))
+                        play_chime(chimes, bubble.value)
+                        effects.acquire().reset(int(bubble.x), int(bubble.y), bubble.radius, bubble.color, game_clock)
+                        bubbles.release(bubble)
                         bubble = None
-                        now = pygame.time.get_ticks()
                         next_spawn_at = now + current_spawn_gap_ms(time_left, SESSION_SECONDS)
 
             elif mode == "PAUSED":
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
                     mode = "PLAYING"
+                    game_clock.resume()
 
             elif mode == "GAME_OVER":
                 if event.type == pygame.KEYDOWN and event.key in (pygame.K_SPACE, pygame.K_RETURN):
@@ -265,14 +755,21 @@ def main():
 
         # Update
         if mode == "PLAYING":
-            now = pygame.time.get_ticks()
-
             time_left -= dt_ms / 1000.0
             if time_left < 0:
                 time_left = 0
 
-            if bubble is None and now >= next_spawn_at:
-                bubble = spawn_bubble(time_left, SESSION_SECONDS)
+            if swarm:
+                # Whole swarm moves, bounces and expires in one vectorized pass each
+                field.move_and_bounce(dt_ms, WIDTH, HEIGHT)
+                field.expire(now)
+                progress = session_progress(time_left, SESSION_SECONDS)
+                wanted = int(lerp(SWARM_COUNT_BASE, SWARM_COUNT_END, progress))
+                if field.n < wanted:
+                    field.spawn(min(wanted - field.n, SWARM_SPAWN_PER_FRAME), now, time_left, SESSION_SECONDS)
+
+            if not swarm and bubble is None and now >= next_spawn_at:
+                bubble = spawn_bubble(time_left, SESSION_SECONDS, game_clock, bubbles.acquire())
 
             # Golden bubbles move; normal bubbles stay still
             if bubble is not None:
@@ -280,17 +777,20 @@ def main():
 
             if bubble is not None and bubble.is_expired(now):
                 score -= 1
+                bubbles.release(bubble)
                 bubble = None
                 next_spawn_at = now + current_spawn_gap_ms(time_left, SESSION_SECONDS)
 
-            if score >= TARGET_SCORE:
+            if score >= target_score:
                 won = True
                 mode = "GAME_OVER"
-            elif time_left <= 0 and score < TARGET_SCORE:
+            elif time_left <= 0 and score < target_score:
                 won = False
                 mode = "GAME_OVER"
+            if mode == "GAME_OVER":
+                session_ended = True
 
-            effects = [e for e in effects if e.alive(now)]
+            effects.sweep(now)
 
         # Draw
         screen.fill(BLACK)
@@ -303,17 +803,19 @@ def main():
             draw_text(screen, f"Win by reaching {TARGET_SCORE} points", 22, WHITE, WIDTH // 2, 300)
             draw_text(screen, f"before the {SESSION_SECONDS}s timer ends.", 22, WHITE, WIDTH // 2, 330)
             draw_text(screen, "Press SPACE or ENTER to start", 22, GREEN, WIDTH // 2, 390)
-            draw_text(screen, "Press P to pause anytime", 18, GREY, WIDTH // 2, 430)
+            draw_text(screen, f"Press S for swarm mode ({SWARM_TARGET_SCORE} points)", 22, GOLD_COLOR, WIDTH // 2, 425)
+            draw_text(screen, "Press P to pause anytime", 18, GREY, WIDTH // 2, 465)
 
         elif mode == "PLAYING":
             draw_text(screen, f"Score: {score}", 22, WHITE, 12, 10, center=False, bold=False)
             secs = max(0, int(math.ceil(time_left)))
             draw_text(screen, f"Time: {secs:02d}s", 22, WHITE, WIDTH - 120, 10, center=False, bold=False)
 
+            if swarm:
+                field.draw(screen)
             if bubble is not None:
                 bubble.draw(screen)
 
-            now = pygame.time.get_ticks()
             for e in effects:
                 e.draw(screen, now)
 
@@ -333,10 +835,15 @@ def main():
             color = GREEN if won else CYAN
             draw_text(screen, title, 48, color, WIDTH // 2, 160)
             draw_text(screen, f"Score: {score}", 26, WHITE, WIDTH // 2, 210)
-            draw_text(screen, f"Target: {TARGET_SCORE}  |  Time: {SESSION_SECONDS}s", 22, GREY, WIDTH // 2, 250)
+            draw_text(screen, f"Target: {target_score}  |  Time: {SESSION_SECONDS}s", 22, GREY, WIDTH // 2, 250)
             draw_text(screen, "SPACE/ENTER: back to Start", 22, GREEN, WIDTH // 2, 320)
 
         pygame.display.flip()
+        latency.flipped()
+        if session_ended:
+            # written after the flip so the final click's frame is counted too
+            latency.write(latency_log, mode="swarm" if swarm else "classic", score=score, finished=True)
+            session_ended = False
 
     pygame.quit()
     sys.exit()
@@ -2,6 +2,7 @@
 import pygame
 import random
 import math
+from concurrent.futures import ThreadPoolExecutor
 
 # B A S I C  C O N F I G
 WIDTH, HEIGHT = 800, 600
@@ -12,11 +13,17 @@ CIRCLE_COLOR  = (230, 200, 80)   # normal circles
 TARGET_COLOR  = (100, 255, 150)  # the one you MUST click
 HEART_COLOR   = (255, 100, 100)  # lives indicator
 DEAD_HEART    = (60, 60, 70)     # lost lives
+GREYED_COLOR  = (80, 80, 90)     # circles after game over
 
 TARGET_RADIUS = 40
 LUCKY_RADIUS  = 60               # bigger target on lucky stages
 NONOVERLAP_MARGIN = 4            # spacing to avoid overlaps
 
+# D E N S E  S T A G E S
+RANDOM_PACKING_DENSITY = 0.45    # share of the screen random placement reliably fills
+DENSE_JITTER = 6                 # max wiggle (px) of each lattice circle
+DENSE_MIN_RADIUS = 10            # circles never shrink below this
+
 # T I M E R
 START_TIME_S = 10.0
 BONUS_TIME_PER_STAGE = 0.75       # time added for every accurate click
@@ -24,41 +31,166 @@ BONUS_TIME_PER_STAGE = 0.75       # time added for every accurate click
 # L I V E S
 MAX_LIVES = 3
 
+# S T A G E  P I P E L I N E
+PREBUILD_STAGES = 2               # upcoming stages built in the background
+
 # H E L P E R S
 
-def rand_pos():
-    """Return a random (x,y) fully on-screen for one circle."""
-    x = random.randint(TARGET_RADIUS, WIDTH - TARGET_RADIUS)
-    y = random.randint(TARGET_RADIUS, HEIGHT - TARGET_RADIUS)
-    return x, y
-
-def non_overlapping_position(existing, attempts=200):
-    """Find a non-overlapping (x,y) given existing circle centers."""
-    min_dist = 2 * TARGET_RADIUS + NONOVERLAP_MARGIN
-    min_d2   = min_dist * min_dist
-    for _ in range(attempts):
-        x, y = rand_pos()
-        ok = True
-        for (ox, oy) in existing:
-            dx, dy = x - ox, y - oy
-            if dx*dx + dy*dy < min_d2:
-                ok = False
+def poisson_disk_positions(n, radius=TARGET_RADIUS, margin=NONOVERLAP_MARGIN, tries=30):
+    """
+    Bridson Poisson-disk sampling of up to n non-overlapping circle centers.
+      - every circle is fully on-screen and centers are at least 2*radius+margin apart
+      - a background grid (cell = min_dist/sqrt(2), so one center per cell) makes each
+        neighbour check O(1), so a whole stage is near-linear instead of O(n^2 * attempts)
+    Returns a list of (x,y); it is shorter than n when n circles cannot fit.
+    """
+    if n <= 0:
+        return []
+    min_dist = 2 * radius + margin
+    min_d2 = min_dist * min_dist
+    cell = min_dist / math.sqrt(2)
+    left, top = radius, radius
+    right, bottom = WIDTH - radius, HEIGHT - radius
+    cols = int((right - left) / cell) + 1
+    rows = int((bottom - top) / cell) + 1
+    grid = [-1] * (cols * rows)      # index into points, -1 = empty cell
+    points = []
+    active = []                      # points that may still have room around them
+
+    def fits(x, y):
+        gx, gy = int((x - left) / cell), int((y - top) / cell)
+        for row in range(max(0, gy - 2), min(rows, gy + 3)):
+            for col in range(max(0, gx - 2), min(cols, gx + 3)):
+                j = grid[row * cols + col]
+                if j != -1:
+                    dx, dy = x - points[j][0], y - points[j][1]
+                    if dx*dx + dy*dy < min_d2:
+                        return False
+        return True
+
+    def add(x, y):
+        grid[int((y - top) / cell) * cols + int((x - left) / cell)] = len(points)
+        active.append(len(points))
+        points.append((x, y))
+
+    add(random.uniform(left, right), random.uniform(top, bottom))
+    while active:
+        a = random.randrange(len(active))
+        px, py = points[active[a]]
+        for _ in range(tries):
+            angle = random.uniform(0, 2 * math.pi)
+            dist = random.uniform(min_dist, 1.5 * min_dist)  # tight ring packs denser
+            x, y = px + math.cos(angle) * dist, py + math.sin(angle) * dist
+            if left <= x <= right and top <= y <= bottom and fits(x, y):
+                add(x, y)
+                break
+        else:
+            active[a] = active[-1]   # no room left around this point
+            active.pop()
+
+    # Bridson leaves small gaps; if we are still short, try to fill each empty cell once
+    if len(points) < n:
+        empty = [i for i in range(cols * rows) if grid[i] == -1]
+        random.shuffle(empty)
+        for i in empty:
+            cx, cy = left + (i % cols) * cell, top + (i // cols) * cell
+            for _ in range(tries):
+                x = random.uniform(cx, min(cx + cell, right))
+                y = random.uniform(cy, min(cy + cell, bottom))
+                if fits(x, y):
+                    add(x, y)
+                    break
+            if len(points) >= n:
                 break
-        if ok:
-            return x, y
-    return rand_pos()
 
-def build_stage(n):
+    # The sample covers the whole screen; a random subset keeps small stages spread out
+    if len(points) > n:
+        points = random.sample(points, n)
+    return [(int(x), int(y)) for (x, y) in points]
+
+def build_hit_grid(positions, radius):
+    """
+    Spatial hash of circle centers for hit tests:
+      - cell size is 2*radius, so a point can only be inside circles whose
+        centers are in its own cell or one of the 8 around it
+      - returns (cell, {(col,row): [indices]})
+    """
+    cell = max(1, 2 * radius)
+    buckets = {}
+    for i, (cx, cy) in enumerate(positions):
+        buckets.setdefault((cx // cell, cy // cell), []).append(i)
+    return cell, buckets
+
+def random_packing_capacity(radius=TARGET_RADIUS, margin=NONOVERLAP_MARGIN):
+    """About how many circles random placement can fit before it starts failing."""
+    min_dist = 2 * radius + margin
+    area = (WIDTH - 2 * radius + min_dist) * (HEIGHT - 2 * radius + min_dist)
+    return int(RANDOM_PACKING_DENSITY * area / (math.pi * (min_dist / 2) ** 2))
+
+def hex_lattice_shape(radius):
+    """
+    Hex lattice for circles of this radius (plus margin and jitter room):
+      - returns (spacing, row_height, cols, offset_cols, rows, capacity)
+      - odd rows are shifted half a step and may hold one circle fewer
+    """
+    spacing = 2 * radius + NONOVERLAP_MARGIN + DENSE_JITTER
+    row_h = spacing * math.sqrt(3) / 2
+    usable_w = WIDTH - 2 * radius - DENSE_JITTER
+    usable_h = HEIGHT - 2 * radius - DENSE_JITTER
+    cols = int(usable_w // spacing) + 1
+    offset_cols = cols if (cols - 1) * spacing + spacing / 2 <= usable_w else cols - 1
+    rows = int(usable_h // row_h) + 1
+    capacity = (rows + 1) // 2 * cols + rows // 2 * offset_cols
+    return spacing, row_h, cols, offset_cols, rows, capacity
+
+def hex_lattice_positions(n, radius):
+    """
+    Up to n circle centers on a jittered hex lattice, in O(n) with no retries.
+    Jitter is at most DENSE_JITTER/2 per axis, which the spacing leaves room for,
+    so circles still never overlap.
+    """
+    spacing, row_h, cols, offset_cols, rows, _ = hex_lattice_shape(radius)
+    half = DENSE_JITTER / 2
+    left = top = radius + half
+    sites = []
+    for row in range(rows):
+        shift = spacing / 2 if row % 2 else 0
+        for col in range(offset_cols if row % 2 else cols):
+            sites.append((left + shift + col * spacing, top + row * row_h))
+    if len(sites) > n:
+        sites = random.sample(sites, n)
+    return [(int(x + random.uniform(-half, half)), int(y + random.uniform(-half, half)))
+            for (x, y) in sites]
+
+def dense_radius(n, radius=TARGET_RADIUS):
+    """Largest radius (<= radius) whose hex lattice holds n circles."""
+    while radius > DENSE_MIN_RADIUS and hex_lattice_shape(radius)[-1] < n:
+        radius -= 1
+    return radius
+
+def build_stage(n, radius):
     """
     Build a stage with n circles:
       - positions: list of (x,y)
       - target_index: index of the one that must be clicked
+      - grid: spatial hash for hit_index, sized for the stage's circle radius
+      - radius: the radius to draw with (smaller than asked on very dense stages)
+    Circles are placed at random (Poisson-disk) while that can fit them; past that
+    the stage switches to a jittered hex lattice, shrinking circles if needed.
     """
-    positions = []
-    for _ in range(n):
-        positions.append(non_overlapping_position(positions))
-    target_index = random.randrange(n)
-    return positions, target_index
+    positions = None
+    if n <= random_packing_capacity(radius):
+        positions = poisson_disk_positions(n, radius)
+        if len(positions) < n:
+            positions = None             # unlucky draw; the lattice always fits
+    if positions is None:
+        radius = dense_radius(n, radius)
+        positions = hex_lattice_positions(n, radius)
+        if len(positions) < n:
+            print(f"Stage {n}: only {len(positions)} circles fit, even at radius {radius}")
+    target_index = random.randrange(len(positions))
+    grid = build_hit_grid(positions, radius)
+    return positions, target_index, grid, radius
 
 def is_lucky_stage():
     """20% chance for a lucky stage with bigger target."""
@@ -69,14 +201,83 @@ def is_milestone(stage):
     milestones = [5, 10, 25, 50, 100, 200, 500]
     return stage in milestones
 
-def hit_index(mx, my, positions, radius):
-    """Return the index of the circle under (mx,my), or -1 if none."""
+def hit_index(mx, my, positions, radius, grid):
+    """Return the index of the circle under (mx,my), or -1 if none.
+    Only circles in the 3x3 grid cells around the point are checked."""
+    cell, buckets = grid
+    gx, gy = mx // cell, my // cell
     r2 = radius * radius
-    for i, (cx, cy) in enumerate(positions):
-        dx, dy = mx - cx, my - cy
-        if dx*dx + dy*dy <= r2:
-            return i
-    return -1
+    found = -1
+    for row in (gy - 1, gy, gy + 1):
+        for col in (gx - 1, gx, gx + 1):
+            for i in buckets.get((col, row), ()):
+                cx, cy = positions[i]
+                dx, dy = mx - cx, my - cy
+                if dx*dx + dy*dy <= r2 and (found == -1 or i < found):
+                    found = i
+    return found
+
+_circle_sprites = {}                   # (radius, color) -> pre-rendered circle
+
+def circle_sprite(radius, color):
+    """Return a cached surface with one filled circle (drawn only the first time)."""
+    key = (radius, color)
+    sprite = _circle_sprites.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        _circle_sprites[key] = sprite
+    return sprite
+
+def stage_blits(positions, radius, target_idx=-1, color=CIRCLE_COLOR):
+    """
+    Build the (sprite, topleft) list for one screen.blits() call.
+    Circles don't move during a stage, so this is built once per stage.
+    """
+    normal = circle_sprite(radius, color)
+    target = circle_sprite(radius, TARGET_COLOR)
+    return [(target if i == target_idx else normal, (cx - radius, cy - radius))
+            for i, (cx, cy) in enumerate(positions)]
+
+def make_stage(n):
+    """Everything stage n needs: (positions, target_idx, hit_grid, lucky, radius)."""
+    lucky = is_lucky_stage()
+    wanted = LUCKY_RADIUS if lucky else TARGET_RADIUS
+    positions, target_idx, grid, radius = build_stage(n, wanted)
+    lucky = lucky and radius == wanted   # dense stages have no room for a bigger target
+    return positions, target_idx, grid, lucky, radius
+
+class StagePipeline:
+    """
+    Builds the next few stages on a worker thread while the player is busy,
+    so advancing a stage is just a swap. take() falls back to building the
+    stage right away if the background copy is not ready yet.
+    """
+    def __init__(self, depth=PREBUILD_STAGES):
+        self.depth = depth
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.pending = {}              # stage number -> Future
+
+    def prefetch(self, current):
+        for n in range(current + 1, current + 1 + self.depth):
+            if n not in self.pending:
+                self.pending[n] = self.pool.submit(make_stage, n)
+
+    def take(self, n):
+        for old in [k for k in self.pending if k < n]:
+            self.pending.pop(old).cancel()
+        future = self.pending.pop(n, None)
+        if future is not None and future.done():
+            stage_data = future.result()
+        else:
+            if future is not None:
+                future.cancel()        # still queued or running; don't wait for it
+            stage_data = make_stage(n)
+        self.prefetch(n)
+        return stage_data
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
 # P Y G A M E  S E T U P
 pygame.init()
@@ -92,9 +293,12 @@ running = True
 game_over = False
 
 stage = 1                              # shows the number of circles
-positions, target_idx = build_stage(stage)
-lucky = is_lucky_stage()               # is current stage lucky?
-current_radius = LUCKY_RADIUS if lucky else TARGET_RADIUS
+stage_pipeline = StagePipeline()       # builds upcoming stages in the background
+# lucky: is current stage lucky? (bigger target)
+positions, target_idx, hit_grid, lucky, current_radius = stage_pipeline.take(stage)
+hover_idx = -1                         # circle under the mouse (-1 = none)
+circle_batch = stage_blits(positions, current_radius, target_idx)
+greyed_batch = None                    # built once, on game over
 
 lives = MAX_LIVES                      # player starts with 3 lives
 milestone_flash = 0                    # countdown timer for milestone celebration
@@ -125,9 +329,13 @@ while running:
         if event.type == pygame.QUIT:
             running = False
 
+        elif event.type == pygame.MOUSEMOTION and not game_over:
+            mx, my = event.pos
+            hover_idx = hit_index(mx, my, positions, current_radius, hit_grid)
+
         elif event.type == pygame.MOUSEBUTTONDOWN and not game_over:
             mx, my = pygame.mouse.get_pos()
-            idx = hit_index(mx, my, positions, current_radius)
+            idx = hit_index(mx, my, positions, current_radius, hit_grid)
 
             if idx == -1 or idx != target_idx:
                 # Wrong click or miss - lose a life
@@ -144,23 +352,25 @@ while running:
                     milestone_flash = 60  # Flash for 60 frames (1 second)
                     print(f"★★★ MILESTONE: Stage {stage}! ★★★")
                 
-                # Build next stage and check if lucky
-                positions, target_idx = build_stage(stage)
-                lucky = is_lucky_stage()
-                current_radius = LUCKY_RADIUS if lucky else TARGET_RADIUS
+                # Swap in the pre-built next stage (built now if it isn't ready)
+                positions, target_idx, hit_grid, lucky, current_radius = stage_pipeline.take(stage)
+                circle_batch = stage_blits(positions, current_radius, target_idx)
+                hover_idx = hit_index(mx, my, positions, current_radius, hit_grid)
 
     # Draw
     screen.fill(BG_COLOR)
 
     if not game_over:
-        # Draw all circles
-        for i, (cx, cy) in enumerate(positions):
-            color = TARGET_COLOR if i == target_idx else CIRCLE_COLOR
-            pygame.draw.circle(screen, color, (cx, cy), current_radius)
+        # Draw all circles in one batch from cached sprites
+        screen.blits(circle_batch, doreturn=False)
+        # Outline the circle under the mouse
+        if hover_idx != -1:
+            pygame.draw.circle(screen, (255, 255, 255), positions[hover_idx], current_radius + 4, 3)
     else:
         # Gray out circles on game over
-        for (cx, cy) in positions:
-            pygame.draw.circle(screen, (80,80,90), (cx, cy), current_radius)
+        if greyed_batch is None:
+            greyed_batch = stage_blits(positions, current_radius, color=GREYED_COLOR)
+        screen.blits(greyed_batch, doreturn=False)
 
     # Draw milestone celebration flash
     if milestone_flash > 0:
@@ -210,4 +420,5 @@ while running:
     pygame.display.flip()
     clock.tick(FPS)
 
+stage_pipeline.shutdown()
 pygame.quit()
\ No newline at end of file
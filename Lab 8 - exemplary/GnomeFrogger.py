@@ -1,5 +1,13 @@
 # Import the pygame library
 import pygame
+from pathlib import Path
+
+# Lane engine that keeps all cars in NumPy arrays (keep frogger_lanes.py in the same folder)
+from frogger_lanes import DEFAULT_LANES, LaneEngine
+# Endless mode streams new lanes in as the gnome climbs (keep frogger_endless.py and frogger_planner.py here too)
+from frogger_endless import CHUNK_ROWS, EndlessLevel
+# Level packs: lanes are loaded from a JSON file that can be edited while the game runs
+from frogger_levels import LevelError, LevelWatcher, load_pack
 
 # Initialize pygame - this must be done before using pygame functions
 pygame.init()
@@ -48,92 +56,152 @@ game_over = False  # Tracks if the game has ended
 difficulty_multiplier = 1.0  # Multiplier for car speeds (increases with score)
 
 # Car/obstacle settings
-# Each lane is a dictionary containing lane info and list of cars
+# Each lane is a dictionary containing lane info and list of cars:
+#   {"row": 2, "direction": 1, "base_speed": 2, "color": RED, "cars": [{"x": 0, "width": 80}, ...]}
 # The "base_speed" is the starting speed that gets multiplied by difficulty_multiplier
-lanes = [
-    # Row 2 - cars moving right
-    {
-        "row": 2,
-        "direction": 1,  # 1 means moving right, -1 means moving left
-        "base_speed": 2,  # Base speed before difficulty multiplier
-        "color": RED,
-        "cars": [
-            {"x": 0, "width": 80},
-            {"x": 250, "width": 80},
-            {"x": 500, "width": 80}
-        ]
-    },
-    # Row 3 - cars moving left
-    {
-        "row": 3,
-        "direction": -1,
-        "base_speed": 3,
-        "color": BLUE,
-        "cars": [
-            {"x": 100, "width": 100},
-            {"x": 400, "width": 100},
-            {"x": 700, "width": 100}
-        ]
-    },
-    # Row 4 - cars moving right
-    {
-        "row": 4,
-        "direction": 1,
-        "base_speed": 2.5,
-        "color": PURPLE,
-        "cars": [
-            {"x": 150, "width": 90},
-            {"x": 450, "width": 90}
-        ]
-    },
-    # Row 6 - cars moving left
-    {
-        "row": 6,
-        "direction": -1,
-        "base_speed": 3.5,
-        "color": ORANGE,
-        "cars": [
-            {"x": 50, "width": 70},
-            {"x": 300, "width": 70},
-            {"x": 550, "width": 70}
-        ]
-    },
-    # Row 7 - cars moving right
-    {
-        "row": 7,
-        "direction": 1,
-        "base_speed": 2,
-        "color": RED,
-        "cars": [
-            {"x": 200, "width": 85},
-            {"x": 500, "width": 85}
-        ]
-    },
-    # Row 8 - cars moving left
-    {
-        "row": 8,
-        "direction": -1,
-        "base_speed": 4,
-        "color": BLUE,
-        "cars": [
-            {"x": 0, "width": 95},
-            {"x": 350, "width": 95},
-            {"x": 650, "width": 95}
-        ]
-    },
-    # Row 9 - cars moving right
-    {
-        "row": 9,
-        "direction": 1,
-        "base_speed": 3,
-        "color": PURPLE,
-        "cars": [
-            {"x": 100, "width": 75},
-            {"x": 400, "width": 75},
-            {"x": 700, "width": 75}
-        ]
-    }
-]
+# The lanes come from the level pack below; the built-in layout in frogger_lanes.py
+# is used if there is no pack
+LEVEL_PACK = Path(__file__).parent / "gnome_frogger_levels.json"  # save changes to it while playing; they load at the next frame
+
+# Pick level `index` of a pack (reaching the goal moves on to the next level)
+# Cars carry on from the current frame instead of starting over
+def load_level(pack, index, frame=0, difficulty=1.0):
+    level = pack.levels[index % len(pack.levels)]
+    engine = level.engine(screen_width, grid_size, difficulty)
+    engine.seek(frame)
+    return level.lanes(), engine
+
+level_index = 0
+try:
+    level_pack = load_pack(LEVEL_PACK)
+except (OSError, LevelError) as e:
+    print(f"Using the built-in lanes ({LEVEL_PACK}: {e})")
+    level_pack = None
+
+if level_pack is not None:
+    lanes, lane_engine = load_level(level_pack, level_index)
+else:
+    lanes = DEFAULT_LANES
+    # Copy every car into flat arrays (lane id, x, width, speed, direction)
+    # so all cars can be moved and checked for collisions in one step each frame
+    lane_engine = LaneEngine(lanes, screen_width, grid_size)
+
+# Watch the pack file; a changed pack is loaded in the background and swapped in
+level_watcher = LevelWatcher(LEVEL_PACK)
+
+# Endless mode (press E): the road keeps going up, generated chunk by chunk from a seed
+# Rows are counted in world rows there (the start row is 0, rows above it are negative)
+endless_mode = False
+endless_level = None
+ENDLESS_SEED = 2024
+CAMERA_ROW = 8   # screen row the gnome is kept on while it climbs
+camera_top = 0   # world row shown at the top of the screen (always 0 in the normal game)
+
+# Build the static playfield (grass, road and grid lines) into its own surface
+# None of it changes during play, so it is drawn once and then blitted each frame
+# (endless mode builds one of these per chunk of rows, with no goal zone)
+def build_background(road_rows, row_count=rows, goal_row=0):
+    background = pygame.Surface((screen_width, row_count * grid_size))
+    background.fill(BLACK)
+    
+    # Draw the lanes from top to bottom
+    for row in range(row_count):
+        if row == goal_row:
+            color = DARK_GREEN  # Goal zone at the top
+        elif row in road_rows:
+            color = GRAY  # Road lane (any row with cars)
+        else:
+            color = GREEN  # Safe zone (green grass)
+        pygame.draw.rect(background, color, (0, grid_size * row, screen_width, grid_size))
+    
+    # Draw grid lines to show the grid structure (optional - helps visualize)
+    for row in range(row_count + 1):
+        # Draw horizontal line at each row boundary
+        pygame.draw.line(background, GRAY, (0, row * grid_size), (screen_width, row * grid_size), 1)
+    
+    for col in range(cols + 1):
+        # Draw vertical line at each column boundary
+        pygame.draw.line(background, GRAY, (col * grid_size, 0), (col * grid_size, row_count * grid_size), 1)
+    
+    return background
+
+# Endless mode: render each chunk's background as soon as it is generated (before it scrolls into view)
+def build_chunk_background(chunk):
+    road_rows = {row - chunk.top_row for row in chunk.road_rows}
+    return build_background(road_rows, CHUNK_ROWS, goal_row=None)
+
+# Start a fresh endless road with the gnome on world row 0
+def new_endless_level():
+    level = EndlessLevel(ENDLESS_SEED, screen_width, grid_size, rows, on_chunk=build_chunk_background)
+    level.prime(-CAMERA_ROW, -CAMERA_ROW + rows - 1)
+    return level
+
+# Draw the gnome with (player_x, player_y) as the middle of its grid square
+def draw_gnome(surface, player_x, player_y, palette):
+    brown, tan, red, pink, white = palette
+    
+    # Gnome body - brown oval/ellipse
+    body_width = 28
+    body_height = 30
+    pygame.draw.ellipse(surface, brown, 
+                       (player_x - body_width // 2, 
+                        player_y - 5, 
+                        body_width, 
+                        body_height))
+    
+    # Gnome head - tan/beige circle
+    head_radius = 12
+    pygame.draw.circle(surface, tan, (player_x, player_y - 10), head_radius)
+    
+    # Gnome hat - red triangle/cone shape
+    # Draw a polygon (triangle) for the pointy hat
+    hat_points = [
+        (player_x - 15, player_y - 10),  # Left base of hat
+        (player_x + 15, player_y - 10),  # Right base of hat
+        (player_x, player_y - 35)        # Top point of hat
+    ]
+    pygame.draw.polygon(surface, red, hat_points)
+    
+    # Gnome nose - small pink circle
+    pygame.draw.circle(surface, pink, (player_x, player_y - 8), 3)
+    
+    # Gnome beard - white triangular shape
+    beard_points = [
+        (player_x - 10, player_y - 5),   # Left top of beard
+        (player_x + 10, player_y - 5),   # Right top of beard
+        (player_x, player_y + 8)         # Bottom point of beard
+    ]
+    pygame.draw.polygon(surface, white, beard_points)
+
+# The gnome and the cars are drawn once into cached sprites and then just blitted
+# A sprite is rebuilt only when its colors or size change
+GNOME_SIZE = (40, 72)
+GNOME_ORIGIN = (20, 40)  # where (player_x, player_y) falls inside the gnome sprite
+gnome_sprites = {}  # palette -> sprite
+car_sprites = {}  # (color, width) -> sprite
+
+def gnome_sprite(palette):
+    if palette not in gnome_sprites:
+        sprite = pygame.Surface(GNOME_SIZE, pygame.SRCALPHA)
+        draw_gnome(sprite, GNOME_ORIGIN[0], GNOME_ORIGIN[1], palette)
+        gnome_sprites[palette] = sprite
+    return gnome_sprites[palette]
+
+def car_sprite(color, width, car_height=30):
+    key = (color, width)
+    if key not in car_sprites:
+        sprite = pygame.Surface((width, car_height), pygame.SRCALPHA)
+        # Draw the main car body
+        pygame.draw.rect(sprite, color, (0, 0, width, car_height))
+        # Draw windows on the car (darker rectangle)
+        window_color = (0, 0, 0)
+        pygame.draw.rect(sprite, window_color, (10, 5, width - 20, 10))
+        car_sprites[key] = sprite
+    return car_sprites[key]
+
+# The background is rebuilt only when the set of road rows changes
+background = None
+background_layout = None
 
 # Game loop control variable
 running = True
@@ -149,22 +217,36 @@ while running:
         
         # Check for keyboard presses (KEYDOWN means key was just pressed, not held)
         if event.type == pygame.KEYDOWN:
+            # Press E at any time to switch between the normal game and endless mode
+            if event.key == pygame.K_e:
+                endless_mode = not endless_mode
+                if endless_level is not None:
+                    endless_level.shutdown()
+                endless_level = new_endless_level() if endless_mode else None
+                game_over = False
+                player_lives = 3
+                player_score = 0
+                player_row = 0 if endless_mode else 11
+                player_col = 7
+                camera_top = -CAMERA_ROW if endless_mode else 0
+                difficulty_multiplier = 1.0
+            
             # Only process movement if game is not over
-            if not game_over:
+            elif not game_over:
                 # Check which key was pressed and move accordingly
                 if event.key == pygame.K_UP:
                     # Move up one row (decrease row number)
                     player_row = player_row - 1
-                    # Keep player from going off top of screen
-                    if player_row < 0:
+                    # Keep player from going off top of screen (endless mode has no top)
+                    if player_row < 0 and not endless_mode:
                         player_row = 0
                 
                 elif event.key == pygame.K_DOWN:
                     # Move down one row (increase row number)
                     player_row = player_row + 1
                     # Keep player from going off bottom of screen
-                    if player_row >= rows:
-                        player_row = rows - 1
+                    if player_row >= camera_top + rows:
+                        player_row = camera_top + rows - 1
                 
                 elif event.key == pygame.K_LEFT:
                     # Move left one column (decrease column number)
@@ -191,42 +273,58 @@ while running:
                     player_row = 11
                     player_col = 7
                     difficulty_multiplier = 1.0  # Reset difficulty
+                    if level_pack is not None and level_index != 0:
+                        level_index = 0
+                        lanes, lane_engine = load_level(level_pack, level_index, lane_engine.frame)
+                    if endless_mode:
+                        endless_level.shutdown()
+                        endless_level = new_endless_level()
+                        player_row = 0
+                        camera_top = -CAMERA_ROW
+    
+    # Swap in the level pack if it was edited (loaded in the background, so this is instant)
+    new_pack = level_watcher.poll()
+    if new_pack is not None:
+        level_pack = new_pack
+        lanes, lane_engine = load_level(level_pack, level_index, lane_engine.frame, difficulty_multiplier)
+        print(f"Reloaded {LEVEL_PACK}: level {level_index % len(level_pack.levels) + 1} "
+              f"of {len(level_pack.levels)}")
     
     # Only update game logic if game is not over
     if not game_over:
-        # Check if player reached the goal (row 0)
-        if player_row == 0:
-            # Player reached the goal!
-            player_score = player_score + 100  # Add 100 points to score
-            
-            # Increase difficulty every time player scores
-            # Add 0.1 to the multiplier (10% speed increase)
-            difficulty_multiplier = difficulty_multiplier + 0.1
-            
-            # Reset player to starting position
-            player_row = 11
-            player_col = 7
+        if endless_mode:
+            # Endless mode: the camera follows the gnome up (never back down),
+            # new chunks stream in above and the score is the best height reached
+            camera_top = min(camera_top, player_row - CAMERA_ROW)
+            endless_level.update(camera_top, camera_top + rows - 1)
+            endless_level.step()
+            player_score = max(player_score, -player_row * 10)
+            cars = endless_level
         
-        # Update car positions - move all cars in all lanes
-        for lane in lanes:
-            # Loop through each car in this lane
-            for car in lane["cars"]:
-                # Calculate current speed using base_speed * difficulty_multiplier
-                current_speed = lane["base_speed"] * difficulty_multiplier
+        else:
+            # Check if player reached the goal (row 0)
+            if player_row == 0:
+                # Player reached the goal!
+                player_score = player_score + 100  # Add 100 points to score
+                
+                # Increase difficulty every time player scores
+                # Add 0.1 to the multiplier (10% speed increase)
+                difficulty_multiplier = difficulty_multiplier + 0.1
                 
-                # Move car based on direction and current speed
-                # direction is 1 (right) or -1 (left)
-                car["x"] = car["x"] + (lane["direction"] * current_speed)
+                # Move on to the next level of the pack (if it has more than one)
+                if level_pack is not None and len(level_pack.levels) > 1:
+                    level_index = level_index + 1
+                    lanes, lane_engine = load_level(level_pack, level_index, lane_engine.frame,
+                                                    difficulty_multiplier)
                 
-                # Wrap car around screen when it goes off edge
-                if lane["direction"] == 1:  # Moving right
-                    # If car goes completely off right side, wrap to left
-                    if car["x"] > screen_width:
-                        car["x"] = -car["width"]
-                else:  # Moving left (direction == -1)
-                    # If car goes completely off left side, wrap to right
-                    if car["x"] + car["width"] < 0:
-                        car["x"] = screen_width
+                # Reset player to starting position
+                player_row = 11
+                player_col = 7
+            
+            # Update car positions - move all cars in all lanes at once
+            # Speed is base_speed * difficulty_multiplier; cars that leave the screen wrap around
+            lane_engine.step(difficulty_multiplier)
+            cars = lane_engine
         
         # Check for collisions between player and cars
         # Calculate player's pixel position and hitbox
@@ -235,136 +333,60 @@ while running:
         player_hitbox_width = grid_size
         player_hitbox_height = grid_size
         
-        # Loop through all lanes to check for collisions
-        for lane in lanes:
-            # Only check collision if player is in this lane's row
-            if player_row == lane["row"]:
-                # Get car's y position in pixels
-                car_y = lane["row"] * grid_size + 10
-                car_height = 30
-                
-                # Check collision with each car in this lane
-                for car in lane["cars"]:
-                    car_x = car["x"]
-                    car_width = car["width"]
-                    
-                    # Rectangle collision detection
-                    # Check if rectangles overlap on both x and y axes
-                    x_overlap = (player_pixel_x < car_x + car_width and 
-                               player_pixel_x + player_hitbox_width > car_x)
-                    y_overlap = (player_pixel_y < car_y + car_height and
-                               player_pixel_y + player_hitbox_height > car_y)
-                    
-                    # If both x and y overlap, there's a collision
-                    if x_overlap and y_overlap:
-                        # Collision detected! Reset player and reduce lives
-                        player_lives = player_lives - 1
-                        
-                        # Check if player has run out of lives
-                        if player_lives <= 0:
-                            game_over = True  # End the game
-                        else:
-                            # Reset player to starting position
-                            player_row = 11
-                            player_col = 7
-                        
-                        # Break out of car loop since we already hit something
-                        break
-    
-    # Fill the screen with a background color
-    screen.fill(BLACK)
-    
-    # Draw the lanes from top to bottom
-    # Row 0 - Goal zone at the top (dark green)
-    pygame.draw.rect(screen, DARK_GREEN, (0, 0, screen_width, grid_size))
-    
-    # Row 1 - Safe zone (green grass)
-    pygame.draw.rect(screen, GREEN, (0, grid_size * 1, screen_width, grid_size))
-    
-    # Rows 2-4 - Road lanes (gray)
-    pygame.draw.rect(screen, GRAY, (0, grid_size * 2, screen_width, grid_size))
-    pygame.draw.rect(screen, GRAY, (0, grid_size * 3, screen_width, grid_size))
-    pygame.draw.rect(screen, GRAY, (0, grid_size * 4, screen_width, grid_size))
-    
-    # Row 5 - Safe zone (green grass)
-    pygame.draw.rect(screen, GREEN, (0, grid_size * 5, screen_width, grid_size))
-    
-    # Rows 6-9 - More road lanes (gray)
-    pygame.draw.rect(screen, GRAY, (0, grid_size * 6, screen_width, grid_size))
-    pygame.draw.rect(screen, GRAY, (0, grid_size * 7, screen_width, grid_size))
-    pygame.draw.rect(screen, GRAY, (0, grid_size * 8, screen_width, grid_size))
-    pygame.draw.rect(screen, GRAY, (0, grid_size * 9, screen_width, grid_size))
+        # Rectangle collision detection against every car at once
+        # Each car is checked along the whole stretch it drove this frame, so even very fast
+        # cars at high difficulty cannot jump over the gnome between frames
+        if cars.collides(player_pixel_x, player_pixel_y, player_hitbox_width, player_hitbox_height):
+            # Collision detected! Reset player and reduce lives
+            player_lives = player_lives - 1
+            
+            # Check if player has run out of lives
+            if player_lives <= 0:
+                game_over = True  # End the game
+            elif endless_mode:
+                # Back to the grass row at the bottom of the current chunk
+                player_row = endless_level.chunk_at(player_row).bottom_row
+                player_col = 7
+                # That row can be below the screen, so bring the camera back down to it
+                # (KEEP_BEHIND_CHUNKS keeps the chunk under it loaded)
+                camera_top = player_row - CAMERA_ROW
+            else:
+                # Reset player to starting position
+                player_row = 11
+                player_col = 7
     
-    # Row 10 - Safe zone (green grass)
-    pygame.draw.rect(screen, GREEN, (0, grid_size * 10, screen_width, grid_size))
+    if endless_mode:
+        # Endless mode: blit the pre-rendered background of every chunk on screen
+        # and collect their cars (world pixels are shifted up by the camera)
+        camera_y = camera_top * grid_size
+        screen.fill(BLACK)
+        visible_cars = []
+        for chunk in endless_level.visible(camera_top, camera_top + rows - 1):
+            screen.blit(chunk.surface, (0, chunk.top_row * grid_size - camera_y))
+            visible_cars.extend(chunk.engine.cars())
+    else:
+        # Draw the static playfield (rebuilt only if the lane layout changed)
+        layout = frozenset(lane["row"] for lane in lanes)
+        if layout != background_layout:
+            background = build_background(layout)
+            background_layout = layout
+        screen.blit(background, (0, 0))
+        camera_y = 0
+        visible_cars = lane_engine.cars()
     
-    # Row 11 - Start zone at the bottom (green grass)
-    pygame.draw.rect(screen, GREEN, (0, grid_size * 11, screen_width, grid_size))
-    
-    # Draw grid lines to show the grid structure (optional - helps visualize)
-    for row in range(rows + 1):
-        # Draw horizontal line at each row boundary
-        pygame.draw.line(screen, GRAY, (0, row * grid_size), (screen_width, row * grid_size), 1)
-    
-    for col in range(cols + 1):
-        # Draw vertical line at each column boundary
-        pygame.draw.line(screen, GRAY, (col * grid_size, 0), (col * grid_size, screen_height), 1)
-    
-    # Draw all cars
-    for lane in lanes:
-        # Get the y position for this lane (centered vertically in the row)
-        car_y = lane["row"] * grid_size + 10  # 10 pixels from top of row
-        car_height = 30  # Height of car rectangles
-        
-        # Draw each car in this lane
-        for car in lane["cars"]:
-            # Draw the main car body
-            pygame.draw.rect(screen, lane["color"], 
-                           (car["x"], car_y, car["width"], car_height))
-            
-            # Draw windows on the car (darker rectangle)
-            window_color = (0, 0, 0)
-            pygame.draw.rect(screen, window_color,
-                           (car["x"] + 10, car_y + 5, car["width"] - 20, 10))
+    # Draw all cars in one batch of blits from their cached sprites
+    car_blits = [(car_sprite(car_color, int(car_width)), (int(car_x), int(car_y) - camera_y))
+                 for car_x, car_y, car_width, car_color in visible_cars]
+    screen.blits(car_blits, doreturn=False)
     
     # Convert player grid position to pixel position
     # Add grid_size // 2 to center the gnome in the grid square
     player_x = player_col * grid_size + grid_size // 2
-    player_y = player_row * grid_size + grid_size // 2
-    
-    # Draw the gnome player
-    # Gnome body - brown oval/ellipse
-    body_width = 28
-    body_height = 30
-    pygame.draw.ellipse(screen, BROWN, 
-                       (player_x - body_width // 2, 
-                        player_y - 5, 
-                        body_width, 
-                        body_height))
-    
-    # Gnome head - tan/beige circle
-    head_radius = 12
-    pygame.draw.circle(screen, TAN, (player_x, player_y - 10), head_radius)
-    
-    # Gnome hat - red triangle/cone shape
-    # Draw a polygon (triangle) for the pointy hat
-    hat_points = [
-        (player_x - 15, player_y - 10),  # Left base of hat
-        (player_x + 15, player_y - 10),  # Right base of hat
-        (player_x, player_y - 35)        # Top point of hat
-    ]
-    pygame.draw.polygon(screen, RED, hat_points)
+    player_y = (player_row - camera_top) * grid_size + grid_size // 2
     
-    # Gnome nose - small pink circle
-    pygame.draw.circle(screen, PINK, (player_x, player_y - 8), 3)
-    
-    # Gnome beard - white triangular shape
-    beard_points = [
-        (player_x - 10, player_y - 5),   # Left top of beard
-        (player_x + 10, player_y - 5),   # Right top of beard
-        (player_x, player_y + 8)         # Bottom point of beard
-    ]
-    pygame.draw.polygon(screen, WHITE, beard_points)
+    # Draw the gnome player from its cached sprite
+    gnome = gnome_sprite((BROWN, TAN, RED, PINK, WHITE))
+    screen.blit(gnome, (player_x - GNOME_ORIGIN[0], player_y - GNOME_ORIGIN[1]))
     
     # Create font for displaying text
     font = pygame.font.Font(None, 36)  # None uses default font, 36 is size
@@ -403,6 +425,12 @@ while running:
         restart_x = (screen_width - restart_text.get_width()) // 2
         restart_y = score_y + 60
         screen.blit(restart_text, (restart_x, restart_y))
+        
+        # Render mode switch hint
+        mode_name = "Classic Mode" if endless_mode else "Endless Mode"
+        mode_text = small_font.render(f"Press E for {mode_name}", True, WHITE)
+        mode_x = (screen_width - mode_text.get_width()) // 2
+        screen.blit(mode_text, (mode_x, restart_y + 60))
     
     # Update the display to show any changes
     pygame.display.flip()
@@ -411,4 +439,7 @@ while running:
     clock.tick(60)
 
 # Clean up and close pygame properly
+if endless_level is not None:
+    endless_level.shutdown()
+level_watcher.stop()
 pygame.quit()
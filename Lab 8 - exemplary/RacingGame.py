@@ -51,18 +51,28 @@ line_gap = 50  # Gap between dashed lines
 total_line_segment = line_height + line_gap
 scroll_speed = 7
 
-# Create lane lines with proper initial spacing
-num_segments = (screen_height // total_line_segment) + 2
-
-# Left divider lines
-left_divider_lines = []
-for i in range(num_segments):
-    left_divider_lines.append(i * total_line_segment)
+# Function to draw the road (asphalt, dashed lane dividers and edge lines) once into a tile
+# The tile is a whole number of dash segments tall and at least as tall as the screen,
+# so two copies stacked on top of each other repeat seamlessly
+def build_road_tile():
+    tile_height = -(-screen_height // total_line_segment) * total_line_segment  # round up
+    tile = pygame.Surface((road_width, tile_height))
+    tile.fill(DARK_GRAY)
+    
+    # Lane dividers (x is measured from the left edge of the road)
+    for divider_x in (lane_width, lane_width * 2):
+        for line_y in range(0, tile_height, total_line_segment):
+            pygame.draw.rect(tile, YELLOW, (divider_x - line_width // 2, line_y, line_width, line_height))
+    
+    # Edge lines
+    pygame.draw.rect(tile, WHITE, (0, 0, 6, tile_height))
+    pygame.draw.rect(tile, WHITE, (road_width - 6, 0, 6, tile_height))
+    return tile
 
-# Right divider lines
-right_divider_lines = []
-for i in range(num_segments):
-    right_divider_lines.append(i * total_line_segment)
+# Scrolling the road is just one offset that wraps around the tile height
+road_tile = build_road_tile()
+road_tile_height = road_tile.get_height()
+road_offset = 0
 
 # Obstacle car properties
 obstacle_cars = []
@@ -178,18 +188,8 @@ while running:
         if car_y > screen_height - car_height:
             car_y = screen_height - car_height
         
-        # Update divider lines
-        for i in range(len(left_divider_lines)):
-            left_divider_lines[i] += scroll_speed
-            if left_divider_lines[i] > screen_height:
-                min_y = min(left_divider_lines)
-                left_divider_lines[i] = min_y - total_line_segment
-        
-        for i in range(len(right_divider_lines)):
-            right_divider_lines[i] += scroll_speed
-            if right_divider_lines[i] > screen_height:
-                min_y = min(right_divider_lines)
-                right_divider_lines[i] = min_y - total_line_segment
+        # Scroll the road (the offset wraps around instead of moving each dash)
+        road_offset = (road_offset + scroll_speed) % road_tile_height
         
         # Spawn new obstacle cars
         spawn_timer += 1
@@ -301,22 +301,10 @@ while running:
     
     else:
         # Draw game screen
-        pygame.draw.rect(screen, DARK_GRAY, (road_left, 0, road_width, screen_height))
-        
-        # Draw lane dividers
-        divider_1_x = road_left + lane_width
-        for line_y in left_divider_lines:
-            if -line_height <= line_y <= screen_height:
-                pygame.draw.rect(screen, YELLOW, (divider_1_x - line_width // 2, line_y, line_width, line_height))
-        
-        divider_2_x = road_left + lane_width * 2
-        for line_y in right_divider_lines:
-            if -line_height <= line_y <= screen_height:
-                pygame.draw.rect(screen, YELLOW, (divider_2_x - line_width // 2, line_y, line_width, line_height))
-        
-        # Draw edge lines
-        pygame.draw.rect(screen, WHITE, (road_left, 0, 6, screen_height))
-        pygame.draw.rect(screen, WHITE, (road_right - 6, 0, 6, screen_height))
+        # The road with its dividers and edge lines is two blits of the pre-drawn tile:
+        # one at the scroll offset and one right above it to fill the gap at the top
+        screen.blit(road_tile, (road_left, road_offset))
+        screen.blit(road_tile, (road_left, road_offset - road_tile_height))
         
         # Draw obstacle cars
         for obstacle in obstacle_cars:
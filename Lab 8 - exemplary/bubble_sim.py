@@ -0,0 +1,196 @@
+# bubble_sim.py — headless difficulty simulator for BubbleClickGame.py
+
+"""Plays thousands of BubbleClickGame sessions without a window, using the game's own
+spawn_bubble / current_spawn_gap_ms / Bubble.is_expired logic and a synthetic player.
+
+The player model: each click attempt takes a random reaction time (log-normal around
+--reaction-ms) and misses with probability --miss-rate; the player keeps trying until
+the bubble is hit or expires. Time jumps from event to event (snapped to 60 FPS frames)
+so a 40 second session takes well under a millisecond.
+
+Examples:
+    python bubble_sim.py --sessions 20000
+    python bubble_sim.py --sweep TARGET_SCORE=15,20,25 --sweep GOLD_CHANCE=0.08,0.12
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import itertools
+import json
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import BubbleClickGame as game
+
+# Game constants a sweep is allowed to change
+TUNABLE = (
+    "TARGET_SCORE", "SESSION_SECONDS", "GOLD_CHANCE", "GOLD_SCORE", "GOLD_LIFETIME_FACTOR",
+    "BUBBLE_MIN_RADIUS_BASE", "BUBBLE_MAX_RADIUS_BASE", "BUBBLE_LIFETIME_MS_BASE",
+    "BUBBLE_MIN_RADIUS_END", "BUBBLE_MAX_RADIUS_END", "BUBBLE_LIFETIME_MS_END",
+    "SPAWN_GAP_MS_BASE", "SPAWN_GAP_MS_END",
+)
+DEFAULTS = {name: getattr(game, name) for name in TUNABLE}
+
+CHUNK_SESSIONS = 500   # sessions per worker task
+
+
+# ---------- Player model ----------
+class PlayerModel:
+    def __init__(self, reaction_ms=450.0, reaction_sigma=0.35, miss_rate=0.15, gold_slowdown=1.3):
+        self.reaction_ms = reaction_ms        # median reaction time
+        self.reaction_sigma = reaction_sigma  # log-normal spread
+        self.miss_rate = miss_rate            # chance a click attempt misses
+        self.gold_slowdown = gold_slowdown    # moving gold bubbles take longer to hit
+
+    def reaction(self, rng, value):
+        rt = rng.lognormvariate(math.log(self.reaction_ms), self.reaction_sigma)
+        if value > 1:
+            rt *= self.gold_slowdown
+        return rt
+
+
+# ---------- Session ----------
+def snap_to_frame(t_ms, frame_ms):
+    """The game only notices events on frame boundaries."""
+    return math.ceil(t_ms / frame_ms) * frame_ms
+
+def run_session(player, rng):
+    """Play one session; returns (score, won)."""
+    session_ms = game.SESSION_SECONDS * 1000.0
+    frame_ms = 1000.0 / game.FPS
+    clock = game.FixedStepClock(frame_ms)
+    bubbles = game.ObjectPool(game.Bubble, 1)  # one recycled Bubble for the whole session
+    score = 0
+    t = 0.0
+
+    while True:
+        time_left = max(0.0, game.SESSION_SECONDS - t / 1000.0)
+        clock.seek(t)
+        bubble = game.spawn_bubble(time_left, game.SESSION_SECONDS, clock, bubbles.acquire())
+
+        click_at = t
+        hit = False
+        while True:
+            click_at += player.reaction(rng, bubble.value)
+            if click_at >= session_ms or bubble.is_expired(click_at):
+                break
+            if rng.random() >= player.miss_rate:
+                hit = True
+                break
+
+        if hit:
+            end = snap_to_frame(click_at, frame_ms)
+            score += bubble.value
+        else:
+            end = snap_to_frame(t + bubble.lifetime_ms, frame_ms)
+            if end >= session_ms:
+                return score, score >= game.TARGET_SCORE
+            score -= 1
+
+        if score >= game.TARGET_SCORE:
+            return score, True
+        if end >= session_ms:
+            return score, False
+
+        time_left = max(0.0, game.SESSION_SECONDS - end / 1000.0)
+        t = snap_to_frame(end + game.current_spawn_gap_ms(time_left, game.SESSION_SECONDS), frame_ms)
+        if t >= session_ms:
+            return score, False
+
+
+def run_chunk(params, player, seed, sessions):
+    """Worker entry point: apply a parameter set and play a batch of sessions."""
+    for name, value in {**DEFAULTS, **params}.items():
+        setattr(game, name, value)
+    random.seed(seed)           # spawn_bubble draws from the module-level random
+    rng = random.Random(seed + 1)
+    return [run_session(player, rng) for _ in range(sessions)]
+
+
+# ---------- Stats ----------
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+def summarize(params, results):
+    scores = sorted(score for score, _ in results)
+    wins = sum(1 for _, won in results if won)
+    histogram = {}
+    for score in scores:
+        histogram[score] = histogram.get(score, 0) + 1
+    return {
+        "params": params,
+        "sessions": len(results),
+        "win_rate": wins / len(results) if results else 0.0,
+        "mean_score": sum(scores) / len(scores) if scores else 0.0,
+        "p10": percentile(scores, 10),
+        "p50": percentile(scores, 50),
+        "p90": percentile(scores, 90),
+        "histogram": histogram,
+    }
+
+
+def simulate(param_sets, player, sessions, workers=None, seed=0):
+    """Run `sessions` sessions for every parameter set over a process pool."""
+    tasks = []
+    for set_index, params in enumerate(param_sets):
+        for start in range(0, sessions, CHUNK_SESSIONS):
+            n = min(CHUNK_SESSIONS, sessions - start)
+            tasks.append((set_index, params, seed + set_index * 1_000_003 + start, n))
+
+    results = [[] for _ in param_sets]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(i, pool.submit(run_chunk, params, player, task_seed, n))
+                   for i, params, task_seed, n in tasks]
+        for i, future in futures:
+            results[i].extend(future.result())
+    return [summarize(params, r) for params, r in zip(param_sets, results)]
+
+
+# ---------- CLI ----------
+def parse_sweep(items):
+    """['TARGET_SCORE=15,20', 'GOLD_CHANCE=0.1'] -> list of parameter dicts (cartesian product)."""
+    axes = []
+    for item in items:
+        name, _, values = item.partition("=")
+        name = name.strip().upper()
+        if name not in TUNABLE:
+            raise SystemExit(f"Unknown parameter {name!r}; choose from {', '.join(TUNABLE)}")
+        kind = type(DEFAULTS[name])
+        axes.append([(name, kind(float(v))) for v in values.split(",") if v.strip()])
+    return [dict(combo) for combo in itertools.product(*axes)] or [{}]
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Monte Carlo difficulty simulator for BubbleClickGame")
+    parser.add_argument("--sessions", type=int, default=10000, help="sessions per parameter set")
+    parser.add_argument("--sweep", action="append", default=[], metavar="NAME=v1,v2",
+                        help="game constant to vary; repeat for a grid sweep")
+    parser.add_argument("--reaction-ms", type=float, default=450.0)
+    parser.add_argument("--reaction-sigma", type=float, default=0.35)
+    parser.add_argument("--miss-rate", type=float, default=0.15)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write full results (with score histograms) to this file")
+    args = parser.parse_args()
+
+    player = PlayerModel(args.reaction_ms, args.reaction_sigma, args.miss_rate)
+    summaries = simulate(parse_sweep(args.sweep), player, args.sessions, args.workers, args.seed)
+
+    for s in summaries:
+        label = ", ".join(f"{k}={v}" for k, v in s["params"].items()) or "defaults"
+        print(f"{label:<40} win {s['win_rate'] * 100:5.1f}%   mean {s['mean_score']:6.2f}   "
+              f"p10/p50/p90 {s['p10']}/{s['p50']}/{s['p90']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@ import pygame
 import random
 import sys
 import math
+import numpy as np
+from pathlib import Path
+from score_store import ScoreStore  # keep score_store.py in the same folder
 
 # Initialize Pygame
 pygame.init()
@@ -27,12 +30,26 @@ GRAY = (128, 128, 128)
 # Frame rate
 FPS = 60
 
+# Leaderboard file (saved next to the game) and how many scores the start screen shows
+SCORE_FILE = Path(__file__).parent / "scores.jsonl"
+LEADERBOARD_SIZE = 5
+
+# Distractor looks: several burnt-cookie variants, each in a few sizes, packed in one atlas.
+DISTRACTOR_VARIANTS = 8
+DISTRACTOR_SIZES = (70, 85, 100)
+ATLAS_CACHE_FILE = None  # e.g. "distractor_atlas.png" to reuse the same atlas between runs
+
 # Game balance constants
 DISTRACTOR_SPAWN_THRESHOLD = 5  # After every 5 points, a new distractor appears.
 DISTRACTORS_PER_SPAWN = 1
 BASE_SPEED = 2
 SPEED_INCREMENT = 0.3
 MAX_SPEED = 8  # Distractors move faster as the player’s score rises, up to MAX_SPEED.
+MAX_DISTRACTORS = 40  # Normal mode stops adding distractors here so long runs don't slow down.
+
+# Swarm difficulty: hundreds of distractors from the very first click.
+SWARM_DISTRACTORS = 300
+SWARM_MAX_DISTRACTORS = 600
 
 # ========================================
 # GAME SETUP - Initialize game components
@@ -103,10 +120,49 @@ def create_burnt_cookie_surface(size=100):
     
     return surf
 
+# Pack every distractor look into one surface, one row per size.
+# Returns the atlas and a list of sub-rects (one per look) to blit from.
+def build_distractor_atlas(variants=DISTRACTOR_VARIANTS, sizes=DISTRACTOR_SIZES, cache_file=ATLAS_CACHE_FILE):
+    width = variants * max(sizes)
+    height = sum(sizes)
+    rects = []
+    y = 0
+    for size in sizes:
+        for v in range(variants):
+            rects.append(pygame.Rect(v * max(sizes), y, size, size))
+        y += size
+
+    # Reuse a saved atlas if it has the layout we expect.
+    if cache_file:
+        try:
+            atlas = pygame.image.load(cache_file).convert_alpha()
+            if atlas.get_size() == (width, height):
+                return atlas, rects
+        except (pygame.error, FileNotFoundError):
+            pass
+
+    # Draw each variant once at full size, then scale it down for the smaller sizes.
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    looks = [create_burnt_cookie_surface(max(sizes)) for _ in range(variants)]
+    for i, rect in enumerate(rects):
+        atlas.blit(pygame.transform.smoothscale(looks[i % variants], rect.size), rect)
+
+    if cache_file:
+        try:
+            pygame.image.save(atlas, cache_file)
+        except pygame.error as e:
+            print(f"Could not save distractor atlas '{cache_file}': {e}")
+    return atlas, rects
+
 # Load the main cookie image or draw one.
 cookie_img = load_cookie_image("cookie.png", 100)
-# Create a list with one “burnt cookie” to use as distractors.
-distractor_imgs = [create_burnt_cookie_surface(100)]
+# Build all “burnt cookie” looks up front, so spawning a distractor is just an index pick.
+distractor_atlas, distractor_rects = build_distractor_atlas()
+distractor_sizes = np.array([rect.size for rect in distractor_rects])
+
+# Pixel masks (made once) so clicks on transparent corners don't count as hits.
+cookie_mask = pygame.mask.from_surface(cookie_img)
+distractor_masks = [pygame.mask.from_surface(distractor_atlas.subsurface(rect)) for rect in distractor_rects]
 
 # ========================================
 # GAME VARIABLES - Store game state
@@ -115,11 +171,21 @@ distractor_imgs = [create_burnt_cookie_surface(100)]
 score = 0
 lives = 3
 game_state = "start"
+difficulty = "normal"  # "normal" or "swarm"
 high_score = 0  # Store best score achieved.
+# Saved scores load and save on a background thread, so the game never waits on the disk.
+score_store = ScoreStore(SCORE_FILE, game="cookie_clicker_challenge", top_n=LEADERBOARD_SIZE)
 cookie_rect = cookie_img.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))  # Track position of the cookie.
-distractors = []  # Hold all moving fake cookies.
 last_spawn_score = 0  # Decide when to spawn new distractors.
 
+# All moving fake cookies live in NumPy arrays (one row each) so they can be
+# moved and bounced in a single step. Only rows [0, distractor_count) are in use.
+distractor_pos = np.zeros((SWARM_MAX_DISTRACTORS, 2))    # top-left x, y
+distractor_vel = np.zeros((SWARM_MAX_DISTRACTORS, 2))    # dx, dy per frame
+distractor_size = np.zeros((SWARM_MAX_DISTRACTORS, 2))   # width, height
+distractor_img = np.zeros(SWARM_MAX_DISTRACTORS, dtype=int)  # index into distractor_rects
+distractor_count = 0
+
 # ========================================
 # GAME FUNCTIONS - Helper functions
 # ========================================
@@ -136,14 +202,17 @@ def draw_text(text, size, color, x, y, center=False):
     screen.blit(surf, rect)
 
 # Reset score, lives, and positions so the player can restart.
-def reset_game():
-    global score, lives, distractors, cookie_rect, game_state, last_spawn_score
+def reset_game(mode="normal"):
+    global score, lives, distractor_count, cookie_rect, game_state, last_spawn_score, difficulty
     score = 0
     lives = 3
-    distractors.clear()
+    distractor_count = 0
     last_spawn_score = 0
     cookie_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
     game_state = "playing"
+    difficulty = mode
+    if difficulty == "swarm":
+        spawn_distractor(SWARM_DISTRACTORS)
 
 # Move cookie to a new random spot within screen boundaries.
 def spawn_cookie():
@@ -152,32 +221,62 @@ def spawn_cookie():
     y = random.randint(margin, SCREEN_HEIGHT - margin)
     cookie_rect.center = (x, y)
 
-# Each time this is called, create a moving burnt cookie.
-def spawn_distractor():
-    img = random.choice(distractor_imgs)
+# Each time this is called, create `count` moving burnt cookies (up to the mode's cap).
+def spawn_distractor(count=1):
+    global distractor_count
+    cap = SWARM_MAX_DISTRACTORS if difficulty == "swarm" else MAX_DISTRACTORS
+    count = min(count, cap - distractor_count)
+    if count <= 0:
+        return
+    new = slice(distractor_count, distractor_count + count)
+    imgs = np.random.randint(len(distractor_rects), size=count)
+    sizes = distractor_sizes[imgs]
     margin = 80
-    rect = img.get_rect(
-        center=(random.randint(margin, SCREEN_WIDTH - margin),
-                random.randint(margin, SCREEN_HEIGHT - margin))
-    )
+    centers = np.column_stack((np.random.randint(margin, SCREEN_WIDTH - margin + 1, size=count),
+                               np.random.randint(margin, SCREEN_HEIGHT - margin + 1, size=count)))
     # Speed increases as score goes up, but is capped at MAX_SPEED.
     current_speed = min(BASE_SPEED + (score // 10) * SPEED_INCREMENT, MAX_SPEED)
-    dx = random.choice([-1, 1]) * random.uniform(current_speed * 0.8, current_speed)
-    dy = random.choice([-1, 1]) * random.uniform(current_speed * 0.8, current_speed)
-    distractors.append([rect, dx, dy, img])
+    directions = np.random.choice([-1, 1], size=(count, 2))
+    distractor_vel[new] = directions * np.random.uniform(current_speed * 0.8, current_speed, size=(count, 2))
+    distractor_pos[new] = centers - sizes // 2
+    distractor_size[new] = sizes
+    distractor_img[new] = imgs
+    distractor_count += count
 
-# Move all distractors every frame.
+# Move all distractors every frame (all of them at once with NumPy).
 def move_distractors():
-    for d in distractors:
-        rect, dx, dy, img = d
-        rect.x += dx
-        rect.y += dy
-        
-        # If they hit an edge, they “bounce” by reversing direction.
-        if rect.left <= 0 or rect.right >= SCREEN_WIDTH:
-            d[1] *= -1
-        if rect.top <= 0 or rect.bottom >= SCREEN_HEIGHT:
-            d[2] *= -1
+    n = distractor_count
+    pos, vel = distractor_pos[:n], distractor_vel[:n]
+    pos += vel
+
+    # If they hit an edge, they “bounce” by reversing direction.
+    far_edge = np.array([SCREEN_WIDTH, SCREEN_HEIGHT]) - distractor_size[:n]
+    hit_edge = (pos <= 0) | (pos >= far_edge)
+    vel[hit_edge] *= -1
+    np.clip(pos, 0, far_edge, out=pos)
+
+# Return the index of the top-most distractor actually under pos, or -1.
+# A vectorized box test narrows the candidates, then each one's pixel mask confirms.
+def distractor_at(pos):
+    n = distractor_count
+    offsets = np.asarray(pos) - distractor_pos[:n].astype(int)  # same rounding as drawing
+    inside = np.all((offsets >= 0) & (offsets < distractor_size[:n]), axis=1)
+    for i in np.flatnonzero(inside)[::-1]:
+        if distractor_masks[distractor_img[i]].get_at(tuple(offsets[i])):
+            return int(i)
+    return -1
+
+# Is pos on a non-transparent pixel of the cookie?
+def cookie_hit(pos):
+    if not cookie_rect.collidepoint(pos):
+        return False
+    return bool(cookie_mask.get_at((pos[0] - cookie_rect.x, pos[1] - cookie_rect.y)))
+
+# Build (atlas, position, sub-rect) triples for one screen.blits() call.
+def distractor_blits():
+    n = distractor_count
+    xy = distractor_pos[:n].astype(int).tolist()
+    return [(distractor_atlas, p, distractor_rects[i]) for i, p in zip(distractor_img[:n].tolist(), xy)]
 
 # ========================================
 # MAIN GAME LOOP
@@ -200,6 +299,8 @@ while running:
         if game_state == "start":
             if event.type == pygame.MOUSEBUTTONDOWN:
                 reset_game()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                reset_game("swarm")
         
         # PLAYING STATE
         # "p" for pauses. "esc" for back to menu.
@@ -214,26 +315,23 @@ while running:
                 mouse_pos = pygame.mouse.get_pos()
                 
                 # Check cookie click.
-                if cookie_rect.collidepoint(mouse_pos):
+                if cookie_hit(mouse_pos):
                     score += 1
                     spawn_cookie()
                     
                     # Spawn new distractors to increase difficulty.
                     if score >= DISTRACTOR_SPAWN_THRESHOLD and \
                        score - last_spawn_score >= DISTRACTOR_SPAWN_THRESHOLD:
-                        for _ in range(DISTRACTORS_PER_SPAWN):
-                            spawn_distractor()
+                        spawn_distractor(DISTRACTORS_PER_SPAWN)
                         last_spawn_score = score
                 
                 # Check distractor clicks.
-                else:
-                    for d in distractors:
-                        if d[0].collidepoint(mouse_pos):
-                            lives -= 1
-                            if lives <= 0:
-                                game_state = "gameover"
-                                high_score = max(high_score, score)
-                            break
+                elif distractor_at(mouse_pos) != -1:
+                    lives -= 1
+                    if lives <= 0:
+                        game_state = "gameover"
+                        high_score = max(high_score, score)
+                        score_store.add(score)
         
         # PAUSED STATE
         # Pressing "P" toggles back to play; "ESC" returns to main menu.
@@ -270,17 +368,29 @@ while running:
                  SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40, center=True)
         draw_text("Click anywhere to start", 40, BLACK,
                  SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40, center=True)
+        draw_text(f"Press S for SWARM mode ({SWARM_DISTRACTORS} distractors)", 30, DARK_RED,
+                 SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80, center=True)
+        draw_text("In swarm mode the golden cookie is always drawn on top.", 22, GRAY,
+                 SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 106, center=True)
+        high_score = max(high_score, score_store.best())
         if high_score > 0:
             draw_text(f"High Score: {high_score}", 36, GOLD,
-                     SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120, center=True)
+                     SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 140, center=True)
+        # Leaderboard (empty until saved scores have loaded).
+        for rank, (best, player, _) in enumerate(score_store.top(), start=1):
+            draw_text(f"{rank}. {player}  {best}", 24, GRAY,
+                     SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150 + rank * 22, center=True)
     
     elif game_state == "playing":
-        # Draw cookie.
-        screen.blit(cookie_img, cookie_rect)
+        # Draw cookie under the distractors (in swarm mode they would cover it
+        # almost completely, so there it is drawn on top of them instead).
+        if difficulty != "swarm":
+            screen.blit(cookie_img, cookie_rect)
         
         # Draw distractors.
-        for d in distractors:
-            screen.blit(d[3], d[0])
+        screen.blits(distractor_blits(), doreturn=False)
+        if difficulty == "swarm":
+            screen.blit(cookie_img, cookie_rect)
         
         # Draw HUD (score, lives, controls).
         draw_text(f"Score: {score}", 32, BLACK, 20, 20)
@@ -326,5 +436,6 @@ while running:
 # CLEANUP - End the game properly
 # ========================================
 
+score_store.close()  # Flush any scores still waiting to be saved.
 pygame.quit()
 sys.exit()
\ No newline at end of file
@@ -0,0 +1,194 @@
+# frogger_endless.py — endless vertical mode for GnomeFrogger.py
+
+"""Streams an endless road upwards in chunks of CHUNK_ROWS rows, generated from a seed.
+
+World rows grow upwards as negative numbers: the gnome starts on row 0 and chunk k covers
+rows -(k * CHUNK_ROWS) (its bottom) up to -(k * CHUNK_ROWS + CHUNK_ROWS - 1) (its top).
+Every chunk starts with a grass row to rest on, followed by road lanes that get faster
+the higher the chunk. Chunk 0 (and anything below it) is the safe start meadow.
+
+- Each chunk has its own LaneEngine. Car positions are closed-form, so a new chunk just
+  seeks to the current frame; nothing is replayed.
+- Chunks are generated LOOKAHEAD_SCREENS screens ahead on a worker thread and handed to
+  the game at most CHUNKS_PER_FRAME per frame, so a chunk is never built in the frame it
+  scrolls into view (`late` counts the times that had to happen anyway; it should stay 0).
+- Chunks more than KEEP_BEHIND_CHUNKS below the view are evicted, so memory and the work
+  per frame stay the same however far the gnome climbs.
+- Every lane keeps gaps of at least MIN_GAP_SQUARES squares, and each chunk is checked
+  with frogger_planner from its grass row at a few start times. A layout that fails is
+  re-rolled; if no attempt passes the chunk is plain grass.
+
+Usage:
+    level = EndlessLevel(seed, screen_width, grid_size, view_rows, on_chunk=render_chunk)
+    level.prime(top_row, bottom_row)      # before the first frame
+    level.update(top_row, bottom_row)     # once per frame, world rows on screen
+    level.step()                          # once per frame, moves the cars
+    level.collides(x, y, width, height)   # player hitbox in world pixels
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from frogger_lanes import LaneEngine, RED, BLUE, PURPLE, ORANGE
+from frogger_planner import CrossingPlanner, FPS
+
+CHUNK_ROWS = 6             # one grass row, then five road rows
+LOOKAHEAD_SCREENS = 3      # chunks are prepared this many screens above the view
+KEEP_BEHIND_CHUNKS = 1     # chunks kept below the view before they are evicted
+CHUNKS_PER_FRAME = 1       # finished chunks handed to the game per frame
+
+MIN_GAP_SQUARES = 3        # smallest gap between two cars of a lane, in grid squares
+CAR_WIDTHS = (70, 75, 80, 85, 90, 95, 100)
+MIN_SPEED = 1.5
+MAX_SPEED = 5.0
+SPEED_RAMP = 0.15          # top speed grows by this much per chunk climbed
+LANE_COLORS = (RED, BLUE, PURPLE, ORANGE)
+
+CHECK_MOVE_EVERY = 6       # the crossability check assumes one key press every 6 frames
+CHECK_START_FRAMES = (0, 97, 211, 307)
+CHECK_HORIZON = 20 * FPS
+MAX_ATTEMPTS = 8
+
+
+# ---------- Generation ----------
+class LaneChunk:
+    def __init__(self, index, lanes, screen_width, grid_size):
+        self.index = index
+        self.top_row = -(index * CHUNK_ROWS + CHUNK_ROWS - 1)
+        self.bottom_row = -(index * CHUNK_ROWS)
+        self.lanes = lanes                      # usual lane dicts, "row" in world rows
+        self.road_rows = frozenset(lane["row"] for lane in lanes)
+        self.engine = LaneEngine(lanes, screen_width, grid_size)
+        self.surface = None                     # set by EndlessLevel's on_chunk callback
+
+def random_lane(rng, row, index, screen_width, grid_size):
+    """One lane whose cars are spread round the lap with at least MIN_GAP_SQUARES between them."""
+    width = rng.choice(CAR_WIDTHS)
+    top_speed = min(MAX_SPEED, MIN_SPEED + 1.0 + SPEED_RAMP * index)
+    speed = round(rng.uniform(MIN_SPEED, top_speed) * 4) / 4   # quarter pixels per frame
+    direction = rng.choice((1, -1))
+
+    lap = screen_width + width
+    min_gap = MIN_GAP_SQUARES * grid_size
+    count = rng.randint(1, max(1, int(lap // (width + min_gap))))
+    spacing = lap / count
+    slack = (spacing - width - min_gap) / 2   # how far each car may drift from even spacing
+    offset = rng.uniform(0, lap)
+    cars = []
+    for i in range(count):
+        lap_pos = (offset + i * spacing + rng.uniform(-slack, slack)) % lap
+        # Same lap convention as LaneEngine: lap position 0 is just off the entry edge
+        x = lap_pos - width if direction > 0 else screen_width - lap_pos
+        cars.append({"x": x, "width": width})
+    return {"row": row, "direction": direction, "base_speed": speed,
+            "color": rng.choice(LANE_COLORS), "cars": cars}
+
+def crossable(lanes, top_row):
+    """Can a player leave the grass row and reach the row above the chunk, from every check start?"""
+    # Re-number rows for the planner: row 0 is the goal (the next chunk's grass row)
+    local = [dict(lane, row=lane["row"] - top_row + 1) for lane in lanes]
+    planner = CrossingPlanner(local, 1.0, CHECK_MOVE_EVERY)
+    start = (CHUNK_ROWS, 7)
+    return all(planner.plan(frame, start, CHECK_HORIZON) is not None for frame in CHECK_START_FRAMES)
+
+def make_chunk(seed, index, screen_width, grid_size):
+    """Chunk `index` for this seed; always the same lanes for the same (seed, index)."""
+    lanes = []
+    if index > 0:
+        rng = random.Random(seed * 1_000_003 + index)
+        top_row = -(index * CHUNK_ROWS + CHUNK_ROWS - 1)
+        for _ in range(MAX_ATTEMPTS):
+            # Bottom row of the chunk stays grass; the rows above it are road
+            lanes = [random_lane(rng, top_row + i, index, screen_width, grid_size)
+                     for i in range(CHUNK_ROWS - 1)]
+            if crossable(lanes, top_row):
+                break
+        else:
+            lanes = []
+    return LaneChunk(index, lanes, screen_width, grid_size)
+
+
+# ---------- Streaming ----------
+class EndlessLevel:
+    def __init__(self, seed, screen_width, grid_size, view_rows, on_chunk=None):
+        self.seed = seed
+        self.screen_width = screen_width
+        self.grid_size = grid_size
+        self.view_rows = view_rows
+        self.on_chunk = on_chunk          # called on the game thread for every new chunk (e.g. to render it)
+        self.frame = 0
+        self.chunks = {}                  # chunk index -> LaneChunk, only around the view
+        self.pending = {}                 # chunk index -> Future
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.late = 0                     # chunks that had to be built in the frame they appeared
+
+    def prime(self, top_row, bottom_row):
+        """Build the first screens right away, before the first frame is drawn."""
+        for index in range(self.chunk_index(bottom_row), self.lookahead_index(top_row) + 1):
+            if index not in self.chunks:
+                self._add(make_chunk(self.seed, index, self.screen_width, self.grid_size))
+
+    def chunk_index(self, row):
+        return -row // CHUNK_ROWS
+
+    def lookahead_index(self, top_row):
+        return self.chunk_index(top_row - LOOKAHEAD_SCREENS * self.view_rows)
+
+    def _add(self, chunk):
+        chunk.engine.seek(self.frame)
+        if self.on_chunk is not None:
+            chunk.surface = self.on_chunk(chunk)
+        self.chunks[chunk.index] = chunk
+
+    def update(self, top_row, bottom_row):
+        """Evict chunks behind the view, queue chunks ahead of it, take in finished ones."""
+        first = self.chunk_index(bottom_row)
+        last = self.chunk_index(top_row)
+
+        for index in [k for k in self.chunks if k < first - KEEP_BEHIND_CHUNKS]:
+            del self.chunks[index]
+        for index in [k for k in self.pending if k < first - KEEP_BEHIND_CHUNKS]:
+            self.pending.pop(index).cancel()
+
+        # Chunks on screen must be ready by now; build them on the spot if not
+        for index in range(first, last + 1):
+            if index not in self.chunks:
+                future = self.pending.pop(index, None)
+                if future is not None:
+                    self._add(future.result())
+                else:
+                    self._add(make_chunk(self.seed, index, self.screen_width, self.grid_size))
+                self.late += 1
+
+        for index in range(last + 1, self.lookahead_index(top_row) + 1):
+            if index not in self.chunks and index not in self.pending:
+                self.pending[index] = self.pool.submit(
+                    make_chunk, self.seed, index, self.screen_width, self.grid_size)
+
+        taken = 0
+        for index in sorted(self.pending):
+            if taken == CHUNKS_PER_FRAME:
+                break
+            if self.pending[index].done():
+                self._add(self.pending.pop(index).result())
+                taken += 1
+
+    def step(self):
+        self.frame += 1
+        for chunk in self.chunks.values():
+            chunk.engine.step(1.0)
+
+    def chunk_at(self, row):
+        return self.chunks.get(self.chunk_index(row))
+
+    def collides(self, x, y, width, height):
+        chunk = self.chunk_at(y // self.grid_size)
+        return chunk is not None and chunk.engine.collides(x, y, width, height)
+
+    def visible(self, top_row, bottom_row):
+        """Chunks overlapping the rows on screen, top first."""
+        return [self.chunks[k] for k in range(self.chunk_index(top_row), self.chunk_index(bottom_row) - 1, -1)
+                if k in self.chunks]
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
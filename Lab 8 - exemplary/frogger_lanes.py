@@ -0,0 +1,253 @@
+# frogger_lanes.py — array-backed lane engine for GnomeFrogger.py
+
+"""Keeps every car of every lane in flat NumPy arrays (one entry per car), so moving,
+wrapping and collision-checking all cars is a handful of array operations per frame
+instead of dict lookups per car.
+
+Positions are never integrated frame by frame: every car's x is a closed-form function
+of its starting x, speed, direction and the difficulty history, so the engine can seek to
+any frame directly (replay scrubbing, rewind, "jump to frame N" in checks).
+
+Build it from the usual list of lane dicts:
+    engine = LaneEngine(lanes, screen_width, grid_size)
+    engine.step(difficulty_multiplier)          # once per frame
+    engine.collides(x, y, width, height)        # player hitbox in pixels (swept over the step)
+    engine.seek(frame)                          # jump to any frame, e.g. 0 to rewind
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+CAR_Y_OFFSET = 10   # cars sit 10 pixels below the top of their row
+CAR_HEIGHT = 30
+
+# Lane colors (same RGB values as GnomeFrogger.py)
+RED = (188, 71, 73)
+BLUE = (0, 100, 200)
+PURPLE = (150, 0, 150)
+ORANGE = (255, 140, 0)
+
+# The lane layout GnomeFrogger.py plays; frogger_planner.py plans against it too
+DEFAULT_LANES = [
+    # Row 2 - cars moving right
+    {
+        "row": 2,
+        "direction": 1,  # 1 means moving right, -1 means moving left
+        "base_speed": 2,  # Base speed before difficulty multiplier
+        "color": RED,
+        "cars": [
+            {"x": 0, "width": 80},
+            {"x": 250, "width": 80},
+            {"x": 500, "width": 80}
+        ]
+    },
+    # Row 3 - cars moving left
+    {
+        "row": 3,
+        "direction": -1,
+        "base_speed": 3,
+        "color": BLUE,
+        "cars": [
+            {"x": 100, "width": 100},
+            {"x": 400, "width": 100},
+            {"x": 700, "width": 100}
+        ]
+    },
+    # Row 4 - cars moving right
+    {
+        "row": 4,
+        "direction": 1,
+        "base_speed": 2.5,
+        "color": PURPLE,
+        "cars": [
+            {"x": 150, "width": 90},
+            {"x": 450, "width": 90}
+        ]
+    },
+    # Row 6 - cars moving left
+    {
+        "row": 6,
+        "direction": -1,
+        "base_speed": 3.5,
+        "color": ORANGE,
+        "cars": [
+            {"x": 50, "width": 70},
+            {"x": 300, "width": 70},
+            {"x": 550, "width": 70}
+        ]
+    },
+    # Row 7 - cars moving right
+    {
+        "row": 7,
+        "direction": 1,
+        "base_speed": 2,
+        "color": RED,
+        "cars": [
+            {"x": 200, "width": 85},
+            {"x": 500, "width": 85}
+        ]
+    },
+    # Row 8 - cars moving left
+    {
+        "row": 8,
+        "direction": -1,
+        "base_speed": 4,
+        "color": BLUE,
+        "cars": [
+            {"x": 0, "width": 95},
+            {"x": 350, "width": 95},
+            {"x": 650, "width": 95}
+        ]
+    },
+    # Row 9 - cars moving right
+    {
+        "row": 9,
+        "direction": 1,
+        "base_speed": 3,
+        "color": PURPLE,
+        "cars": [
+            {"x": 100, "width": 75},
+            {"x": 400, "width": 75},
+            {"x": 700, "width": 75}
+        ]
+    }
+]
+
+
+class LaneEngine:
+    def __init__(self, lanes, screen_width, grid_size, difficulty_multiplier=1.0):
+        # Per-car data (lane id links each car back to its lane)
+        car_lane, car_x, car_width = [], [], []
+        for lane_id, lane in enumerate(lanes):
+            for car in lane["cars"]:
+                car_lane.append(lane_id)
+                car_x.append(car["x"])
+                car_width.append(car["width"])
+        self._setup([lane["row"] for lane in lanes],
+                    [lane["direction"] for lane in lanes],
+                    [lane["base_speed"] for lane in lanes],
+                    [lane["color"] for lane in lanes],
+                    car_lane, car_x, car_width, screen_width, grid_size, difficulty_multiplier)
+
+    @classmethod
+    def from_tables(cls, lane_row, lane_dir, lane_speed, lane_color, car_lane, car_x, car_width,
+                    screen_width, grid_size, difficulty_multiplier=1.0):
+        """Build straight from lane and car tables (one entry per lane / per car), e.g. a compiled level."""
+        engine = cls.__new__(cls)
+        engine._setup(lane_row, lane_dir, lane_speed, lane_color, car_lane, car_x, car_width,
+                      screen_width, grid_size, difficulty_multiplier)
+        return engine
+
+    def _setup(self, lane_row, lane_dir, lane_speed, lane_color, car_lane, car_x, car_width,
+               screen_width, grid_size, difficulty_multiplier):
+        self.screen_width = screen_width
+        self.grid_size = grid_size
+
+        # Per-lane data
+        self.lane_row = np.asarray(lane_row, dtype=int)
+        self.lane_color = [tuple(color) if color is not None else None for color in lane_color]
+
+        # Per-car data; speed and direction come from the car's lane
+        self.car_lane = np.asarray(car_lane, dtype=int)
+        self.car_x0 = np.asarray(car_x, dtype=float)        # x at frame 0
+        self.car_width = np.asarray(car_width, dtype=float)
+        self.car_speed = np.asarray(lane_speed, dtype=float)[self.car_lane]  # base speed, before difficulty
+        self.car_dir = np.asarray(lane_dir, dtype=float)[self.car_lane]      # 1 = right, -1 = left
+        self.car_y = (self.lane_row[self.car_lane] * grid_size + CAR_Y_OFFSET).astype(float)
+
+        # A car drives a lap of screen_width + width pixels, then it is back where it started.
+        # car_start is how far into its lap each car is at frame 0: a right-moving car starts
+        # its lap just off the left edge, a left-moving one just off the right edge.
+        self.car_lap = screen_width + self.car_width
+        self.car_start = np.where(self.car_dir > 0,
+                                  self.car_x0 + self.car_width,
+                                  screen_width - self.car_x0)
+
+        # Difficulty history as segments: from frame seg_frame[i] on, every frame adds
+        # seg_difficulty[i] to the travel (seg_travel[i] is the travel at seg_frame[i])
+        self.seg_frame = [0]
+        self.seg_travel = [0.0]
+        self.seg_difficulty = [difficulty_multiplier]
+
+        self.frame = 0
+        self.seek(0)
+
+    # ---------- Closed-form motion ----------
+    def travel(self, frame):
+        """Sum of the difficulty multipliers over the first `frame` frames.
+
+        A car has moved base_speed * travel pixels by then. Frames past the last recorded
+        difficulty change keep the last difficulty.
+        """
+        i = bisect_right(self.seg_frame, frame) - 1
+        return self.seg_travel[i] + self.seg_difficulty[i] * (frame - self.seg_frame[i])
+
+    def positions(self, travel):
+        """x of every car once the lanes have moved `travel` (see travel())."""
+        lap_pos = (self.car_start + self.car_speed * travel) % self.car_lap
+        return np.where(self.car_dir > 0, lap_pos - self.car_width, self.screen_width - lap_pos)
+
+    def seek(self, frame, from_frame=None):
+        """Jump to any frame, forwards or backwards, without replaying the frames between.
+
+        collides() then tests the motion from `from_frame` (default: the frame before) to here.
+        """
+        if from_frame is None:
+            from_frame = max(frame - 1, 0)
+        self.frame = frame
+        self.prev_travel = self.travel(from_frame)
+        self.cur_travel = self.travel(frame)
+        self.car_x = self.positions(self.cur_travel)
+
+    def step(self, difficulty_multiplier, frames=1):
+        """Move every car `frames` frames; cars that leave the screen come back on the other side.
+
+        Stepping several frames at once (a lower simulation rate) loses no hits, since
+        collides() tests everything the cars covered during the step.
+        """
+        i = bisect_right(self.seg_frame, self.frame) - 1
+        if self.seg_frame[-1] > self.frame or self.seg_difficulty[i] != difficulty_multiplier:
+            # New difficulty (or playing on after a rewind): history from here on is rewritten
+            travel = self.travel(self.frame)
+            del self.seg_frame[i + 1:], self.seg_travel[i + 1:], self.seg_difficulty[i + 1:]
+            if self.seg_frame[i] == self.frame:
+                self.seg_travel[i], self.seg_difficulty[i] = travel, difficulty_multiplier
+            else:
+                self.seg_frame.append(self.frame)
+                self.seg_travel.append(travel)
+                self.seg_difficulty.append(difficulty_multiplier)
+        self.seek(self.frame + frames, self.frame)
+
+    # ---------- Collisions ----------
+    def swept_x_overlap(self, x, width, travel_from, travel_to):
+        """Which cars covered any part of [x, x + width) while the lanes moved from
+        travel_from to travel_to (a swept AABB test along the lane, wraparound included).
+
+        x may be an array shaped (n, 1) to test n boxes against every car at once.
+        """
+        # Lap positions at which each car overlaps the box: an open interval (lo, hi)
+        lo = np.where(self.car_dir > 0, x, self.screen_width - x - width)
+        hi = lo + width + self.car_width
+        # The car swept the unwrapped lap positions [start, end]; find the first copy of
+        # (lo, hi) that ends after start and check that it begins before end
+        start = self.car_start + self.car_speed * travel_from
+        end = self.car_start + self.car_speed * travel_to
+        laps = np.floor((start - hi) / self.car_lap) + 1
+        return lo + laps * self.car_lap < end
+
+    def collides(self, x, y, width, height):
+        """True if any car touched the rectangle during the last step.
+
+        Cars only move sideways, so the box is tested against the whole stretch each car
+        drove in that step rather than just where it stopped; fast cars cannot jump it.
+        """
+        x_overlap = self.swept_x_overlap(x, width, self.prev_travel, self.cur_travel)
+        y_overlap = (y < self.car_y + CAR_HEIGHT) & (y + height > self.car_y)
+        return bool(np.any(x_overlap & y_overlap))
+
+    def cars(self):
+        """(x, y, width, color) for every car, for drawing."""
+        colors = self.lane_color
+        return [(x, y, w, colors[lane]) for x, y, w, lane in
+                zip(self.car_x.tolist(), self.car_y.tolist(), self.car_width.tolist(), self.car_lane.tolist())]
@@ -0,0 +1,305 @@
+# frogger_levels.py — level packs for GnomeFrogger.py
+
+"""Lane layouts live in a JSON level pack instead of the game's source:
+
+    {
+      "name": "Gnome Frogger",
+      "levels": [
+        {"name": "Morning traffic",
+         "lanes": [
+           {"row": 2, "direction": 1, "base_speed": 2, "color": "red",
+            "cars": [{"x": 0, "width": 80}, {"x": 250, "width": 80}]}
+         ]}
+      ]
+    }
+
+"color" is one of the names in COLOR_NAMES or an [r, g, b] list; "direction" is 1 (right)
+or -1 (left). Every problem in a pack is reported at once, with where it is
+(e.g. "levels[0].lanes[3].base_speed: must be a positive number").
+
+- load_pack() validates the JSON once and compiles it to lane and car tables, saved next
+  to the source as <pack>.cache.npz together with the source's SHA-256. Later loads only
+  hash the source and read the tables back; the JSON is not parsed again until it changes.
+- LevelWatcher checks the pack in a background thread and loads (compiles) a changed pack
+  there, so the game just calls poll() every frame and swaps the level in when one arrives.
+  A pack that fails to load is reported and the game keeps the level it has.
+
+Usage:
+    pack = load_pack("gnome_frogger_levels.json")
+    engine = pack.levels[0].engine(screen_width, grid_size)
+    watcher = LevelWatcher("gnome_frogger_levels.json")
+    new_pack = watcher.poll()   # once per frame; None until the file changes
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from frogger_lanes import LaneEngine, RED, BLUE, PURPLE, ORANGE
+
+CACHE_VERSION = 1
+COLOR_NAMES = {"red": RED, "blue": BLUE, "purple": PURPLE, "orange": ORANGE}
+
+# Playfield limits a lane must fit in (must match GnomeFrogger.py)
+ROWS = 12
+SCREEN_WIDTH = 800
+
+
+class LevelError(ValueError):
+    """A level pack that cannot be used; the message lists every problem found."""
+
+
+# ---------- Levels ----------
+class Level:
+    """One level as lane and car tables (car_lane indexes this level's lanes)."""
+
+    def __init__(self, name, lane_row, lane_dir, lane_speed, lane_color, car_lane, car_x, car_width):
+        self.name = name
+        self.lane_row = lane_row
+        self.lane_dir = lane_dir
+        self.lane_speed = lane_speed
+        self.lane_color = lane_color    # (lanes, 3) uint8
+        self.car_lane = car_lane
+        self.car_x = car_x
+        self.car_width = car_width
+
+    def engine(self, screen_width, grid_size, difficulty_multiplier=1.0):
+        return LaneEngine.from_tables(self.lane_row, self.lane_dir, self.lane_speed,
+                                      [tuple(int(c) for c in color) for color in self.lane_color],
+                                      self.car_lane, self.car_x, self.car_width,
+                                      screen_width, grid_size, difficulty_multiplier)
+
+    def lanes(self):
+        """The level as the usual list of lane dicts (for the background, the planner, ...)."""
+        lanes = [{"row": int(row), "direction": int(direction), "base_speed": float(speed),
+                  "color": tuple(int(c) for c in color), "cars": []}
+                 for row, direction, speed, color in
+                 zip(self.lane_row, self.lane_dir, self.lane_speed, self.lane_color)]
+        for lane, x, width in zip(self.car_lane.tolist(), self.car_x.tolist(), self.car_width.tolist()):
+            lanes[lane]["cars"].append({"x": x, "width": width})
+        return lanes
+
+class LevelPack:
+    def __init__(self, name, levels, source_hash, from_cache):
+        self.name = name
+        self.levels = levels
+        self.source_hash = source_hash
+        self.from_cache = from_cache    # True if the compiled tables were reused
+
+
+# ---------- Validation ----------
+def is_number(value):
+    # json.loads accepts NaN and Infinity, which would poison the lane maths
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def check_lane(lane, where, problems, rows_used):
+    if not isinstance(lane, dict):
+        problems.append(f"{where}: must be an object")
+        return
+    for key in lane.keys() - {"row", "direction", "base_speed", "color", "cars"}:
+        problems.append(f"{where}.{key}: unknown field")
+
+    row = lane.get("row")
+    if not isinstance(row, int) or isinstance(row, bool) or not 1 <= row <= ROWS - 2:
+        problems.append(f"{where}.row: must be a whole number from 1 to {ROWS - 2}")
+    elif row in rows_used:
+        problems.append(f"{where}.row: row {row} already has a lane")
+    else:
+        rows_used.add(row)
+    if lane.get("direction") not in (1, -1):
+        problems.append(f"{where}.direction: must be 1 (right) or -1 (left)")
+    if not is_number(lane.get("base_speed")) or lane["base_speed"] <= 0:
+        problems.append(f"{where}.base_speed: must be a positive number")
+
+    color = lane.get("color")
+    if isinstance(color, str):
+        if color.lower() not in COLOR_NAMES:
+            problems.append(f"{where}.color: unknown color {color!r} (use {', '.join(COLOR_NAMES)} or [r, g, b])")
+    elif not (isinstance(color, list) and len(color) == 3
+              and all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in color)):
+        problems.append(f"{where}.color: must be a color name or [r, g, b] with values 0-255")
+
+    cars = lane.get("cars")
+    if not isinstance(cars, list):
+        problems.append(f"{where}.cars: must be a list")
+        return
+    for j, car in enumerate(cars):
+        here = f"{where}.cars[{j}]"
+        if not isinstance(car, dict):
+            problems.append(f"{here}: must be an object")
+            continue
+        for key in car.keys() - {"x", "width"}:
+            problems.append(f"{here}.{key}: unknown field")
+        if not is_number(car.get("x")):
+            problems.append(f"{here}.x: must be a number")
+        if not is_number(car.get("width")) or not 0 < car["width"] <= SCREEN_WIDTH:
+            problems.append(f"{here}.width: must be a number from 1 to {SCREEN_WIDTH}")
+
+def validate(source):
+    """Raise LevelError listing every problem in a parsed pack."""
+    problems = []
+    if not isinstance(source, dict):
+        raise LevelError("pack: must be an object with a \"levels\" list")
+    for key in source.keys() - {"name", "levels"}:
+        problems.append(f"{key}: unknown field")
+    levels = source.get("levels")
+    if not isinstance(levels, list) or not levels:
+        problems.append("levels: must be a non-empty list")
+        levels = []
+    for i, level in enumerate(levels):
+        where = f"levels[{i}]"
+        if not isinstance(level, dict):
+            problems.append(f"{where}: must be an object")
+            continue
+        for key in level.keys() - {"name", "lanes"}:
+            problems.append(f"{where}.{key}: unknown field")
+        lanes = level.get("lanes")
+        if not isinstance(lanes, list):
+            problems.append(f"{where}.lanes: must be a list")
+            continue
+        rows_used = set()
+        for j, lane in enumerate(lanes):
+            check_lane(lane, f"{where}.lanes[{j}]", problems, rows_used)
+    if problems:
+        raise LevelError("; ".join(problems))
+
+
+# ---------- Compiling ----------
+def compile_tables(source):
+    """Validated pack -> flat tables for every level (lane_level / car_lane say what belongs where)."""
+    lane_level, lane_row, lane_dir, lane_speed, lane_color = [], [], [], [], []
+    car_lane, car_x, car_width = [], [], []
+    names = []
+    for i, level in enumerate(source["levels"]):
+        names.append(str(level.get("name", f"Level {i + 1}")))
+        for lane in level["lanes"]:
+            color = lane["color"]
+            for car in lane["cars"]:
+                car_lane.append(len(lane_row))
+                car_x.append(car["x"])
+                car_width.append(car["width"])
+            lane_level.append(i)
+            lane_row.append(lane["row"])
+            lane_dir.append(lane["direction"])
+            lane_speed.append(lane["base_speed"])
+            lane_color.append(COLOR_NAMES[color.lower()] if isinstance(color, str) else color)
+    return {
+        "version": np.array(CACHE_VERSION),
+        "pack_name": np.array(str(source.get("name", ""))),
+        "level_names": np.array(names, dtype=str),
+        "lane_level": np.array(lane_level, dtype=np.int32),
+        "lane_row": np.array(lane_row, dtype=np.int16),
+        "lane_dir": np.array(lane_dir, dtype=np.int8),
+        "lane_speed": np.array(lane_speed, dtype=np.float64),
+        "lane_color": np.array(lane_color, dtype=np.uint8).reshape(-1, 3),
+        "car_lane": np.array(car_lane, dtype=np.int32),
+        "car_x": np.array(car_x, dtype=np.float64),
+        "car_width": np.array(car_width, dtype=np.float64),
+    }
+
+def tables_to_pack(tables, source_hash, from_cache):
+    lane_level = tables["lane_level"]
+    car_lane = tables["car_lane"]
+    levels = []
+    for i, name in enumerate(tables["level_names"].tolist()):
+        lanes = np.flatnonzero(lane_level == i)
+        first = lanes[0] if len(lanes) else 0
+        cars = np.isin(car_lane, lanes)
+        levels.append(Level(name, tables["lane_row"][lanes], tables["lane_dir"][lanes],
+                            tables["lane_speed"][lanes], tables["lane_color"][lanes],
+                            car_lane[cars] - first, tables["car_x"][cars], tables["car_width"][cars]))
+    return LevelPack(str(tables["pack_name"]), levels, source_hash, from_cache)
+
+def cache_path(path):
+    path = Path(path)
+    return path.with_name(path.name + ".cache.npz")
+
+def read_cache(path, source_hash):
+    try:
+        with np.load(cache_path(path), allow_pickle=False) as cached:
+            if int(cached["version"]) != CACHE_VERSION or str(cached["source_hash"]) != source_hash:
+                return None
+            return {key: cached[key] for key in cached.files}
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        return None   # missing, stale format, truncated or damaged: compile again
+
+def write_cache(path, tables, source_hash):
+    target = cache_path(path)
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, source_hash=np.array(source_hash), **tables)
+        os.replace(tmp, target)
+    except OSError as e:
+        print(f"Could not write level cache '{target}': {e}")
+
+def load_pack(path):
+    """Load a level pack, reusing its compiled tables when the source has not changed.
+
+    Raises FileNotFoundError if there is no pack, LevelError if it is not valid.
+    """
+    data = Path(path).read_bytes()
+    source_hash = hashlib.sha256(data).hexdigest()
+    tables = read_cache(path, source_hash)
+    if tables is not None:
+        return tables_to_pack(tables, source_hash, from_cache=True)
+
+    try:
+        source = json.loads(data)
+    except ValueError as e:
+        raise LevelError(f"not valid JSON: {e}") from None
+    validate(source)
+    tables = compile_tables(source)
+    write_cache(path, tables, source_hash)
+    return tables_to_pack(tables, source_hash, from_cache=False)
+
+
+# ---------- Hot reload ----------
+class LevelWatcher:
+    """Watches a pack file from a background thread; poll() hands over a freshly loaded pack."""
+
+    def __init__(self, path, interval=0.25):
+        self.path = Path(path)
+        self.interval = interval
+        self._seen = self._stamp()
+        self._latest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="level-watcher", daemon=True)
+        self._thread.start()
+
+    def _stamp(self):
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            stamp = self._stamp()
+            if stamp is None or stamp == self._seen:
+                continue
+            self._seen = stamp
+            try:
+                pack = load_pack(self.path)
+            except (OSError, LevelError) as e:
+                print(f"Level pack '{self.path}' not reloaded: {e}")
+                continue
+            with self._lock:
+                self._latest = pack
+
+    def poll(self):
+        """The newest pack loaded since the last call, or None."""
+        with self._lock:
+            pack, self._latest = self._latest, None
+        return pack
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,285 @@
+# frogger_planner.py — path-planning bot and difficulty sweep for GnomeFrogger.py
+
+"""Finds the fastest safe crossing of GnomeFrogger's road by breadth-first search over
+(row, col, frame), using car positions predicted from each lane's speed and direction.
+
+Frame semantics follow the game loop: on every frame the player may move one square,
+reaching row 0 scores immediately, then the cars step and the player's square is checked
+against them. The bot presses a key at most every --move-every frames (a fast human
+manages roughly one press every 6 frames at 60 FPS).
+
+Lane predictions use LaneEngine's closed-form positions, the same ones the game draws.
+Deadly squares are memoized per lane by the lane's phase within its lap, so thousands of
+crossings cost far less than playing them in real time.
+
+Examples:
+    python frogger_planner.py --goals 20 --crossings 2000
+    python frogger_planner.py --difficulty 1.0,2.5,4.0 --move-every 4 --json sweep.json
+    python frogger_planner.py --pack gnome_frogger_levels.json --level 2
+"""
+
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from frogger_lanes import DEFAULT_LANES, LaneEngine, CAR_HEIGHT
+
+# Playfield and rules (must match GnomeFrogger.py)
+SCREEN_WIDTH = 800
+GRID_SIZE = 50
+ROWS = 12
+COLS = 16
+START_ROW = 11
+START_COL = 7
+GOAL_ROW = 0
+DIFFICULTY_STEP = 0.1   # added to difficulty_multiplier for every goal
+FPS = 60
+
+CHUNK_CROSSINGS = 500   # crossings per worker task
+START_WINDOW = 60 * FPS # crossings start at a random frame within the first minute
+
+
+# ---------- Predicted lane occupancy ----------
+def lane_key(lane):
+    """Hashable description of a lane (everything but its color)."""
+    cars = tuple((car["x"], car["width"]) for car in lane["cars"])
+    return (lane["row"], lane["direction"], lane["base_speed"], cars)
+
+class LaneOccupancy:
+    """Deadly columns of one lane at one difficulty, frame by frame.
+
+    All cars of a lane move together, so the lane looks the same every time it has moved
+    a whole lap (screen width + car width). Masks are memoized by how far into that lap
+    the lane is, so each distinct phase is evaluated once however many frames are asked for.
+    """
+
+    def __init__(self, key, difficulty, screen_width=SCREEN_WIDTH, grid_size=GRID_SIZE, cols=COLS):
+        row, direction, base_speed, cars = key
+        lane = {"row": row, "direction": direction, "base_speed": base_speed, "color": None,
+                "cars": [{"x": x, "width": width} for x, width in cars]}
+        self.engine = LaneEngine([lane], screen_width, grid_size, difficulty)
+        self.grid_size = grid_size
+        self.col_left = np.arange(cols) * grid_size
+
+        # Grid rows whose player hitbox overlaps this lane's cars
+        car_top = self.engine.car_y[0] if cars else None
+        self.rows = [r for r in range(ROWS) if car_top is not None
+                     and r * grid_size < car_top + CAR_HEIGHT and r * grid_size + grid_size > car_top]
+
+        # One lap in units of travel (cars with mixed widths have no common lap; then frames are the key)
+        widths = {width for _, width in cars}
+        self.difficulty = difficulty
+        self.lap = (screen_width + widths.pop()) / base_speed if len(widths) == 1 and base_speed else None
+        # Laps that take a whole number of frames are memoized by frame within the lap
+        lap_frames = self.lap / difficulty if self.lap and difficulty else 0
+        self.lap_frames = round(lap_frames) if lap_frames and abs(lap_frames - round(lap_frames)) < 1e-6 else None
+        self.masks = {}          # phase -> bit c set = column c is deadly
+
+    def blocked(self, frame):
+        if self.lap_frames:
+            phase = frame % self.lap_frames
+            travel = self.difficulty * phase
+        else:
+            travel = self.difficulty * frame
+            phase = round(travel % self.lap, 9) if self.lap else frame
+        mask = self.masks.get(phase)
+        if mask is None:
+            # Same swept test the game uses: everything the cars covered since the frame before
+            travel = travel % self.lap if self.lap else travel
+            hit = self.engine.swept_x_overlap(self.col_left[:, None], self.grid_size,
+                                              travel - self.difficulty, travel)
+            mask = sum(1 << int(c) for c in np.flatnonzero(hit.any(axis=1)))
+            self.masks[phase] = mask
+        return mask
+
+@lru_cache(maxsize=256)   # bounded: frogger_endless checks new lanes for as long as it runs
+def lane_occupancy(key, difficulty):
+    return LaneOccupancy(key, difficulty)
+
+
+# ---------- Planner ----------
+class CrossingPlanner:
+    def __init__(self, lanes=DEFAULT_LANES, difficulty=1.0, move_every=1):
+        self.difficulty = difficulty
+        self.move_every = max(1, move_every)
+        self.lanes = [lane_occupancy(lane_key(lane), difficulty) for lane in lanes]
+        self.deadly = {}   # frame -> deadly_rows(frame); crossings from nearby start frames share it
+
+    def deadly_rows(self, frame):
+        """One column bitmask per grid row: the squares a car covers on this frame."""
+        deadly = self.deadly.get(frame)
+        if deadly is None:
+            deadly = [0] * ROWS
+            for lane in self.lanes:
+                mask = lane.blocked(frame)
+                for r in lane.rows:
+                    deadly[r] |= mask
+            self.deadly[frame] = deadly
+        return deadly
+
+    def plan(self, start_frame=0, start=(START_ROW, START_COL), horizon=30 * FPS):
+        """Fastest safe crossing from `start` beginning at `start_frame`.
+
+        Returns [(frame, row, col), ...] from the start to the goal square, or None when no
+        safe path reaches the goal within `horizon` frames (every option gets hit, or the
+        goal is simply out of reach in time).
+        """
+        full = (1 << COLS) - 1
+        reach = [0] * ROWS          # squares the gnome can be on safely, as column bitmasks
+        reach[start[0]] = 1 << start[1]
+        history = [reach]
+        for step in range(1, horizon + 1):
+            if step % self.move_every == 0:
+                # Stay, or move one square in any direction
+                cand = [(m | (m << 1) | (m >> 1)) & full for m in reach]
+                for r in range(ROWS):
+                    if r > 0:
+                        cand[r] |= reach[r - 1]
+                    if r < ROWS - 1:
+                        cand[r] |= reach[r + 1]
+            else:
+                cand = reach
+            if cand[GOAL_ROW]:
+                history.append(cand)
+                return self._path(history, start_frame)
+            deadly = self.deadly_rows(start_frame + step)
+            reach = [m & ~d for m, d in zip(cand, deadly)]
+            if not any(reach):
+                return None
+            history.append(reach)
+        return None
+
+    def _path(self, history, start_frame):
+        goal = history[-1][GOAL_ROW]
+        row, col = GOAL_ROW, (goal & -goal).bit_length() - 1
+        path = [(start_frame + len(history) - 1, row, col)]
+        for step in range(len(history) - 1, 0, -1):
+            prev = history[step - 1]
+            options = [(row, col)]
+            if step % self.move_every == 0:
+                options += [(row + 1, col), (row - 1, col), (row, col - 1), (row, col + 1)]
+            for r, c in options:
+                if 0 <= r < ROWS and 0 <= c < COLS and prev[r] >> c & 1:
+                    row, col = r, c
+                    break
+            path.append((start_frame + step - 1, row, col))
+        path.reverse()
+        return path
+
+def path_keys(path):
+    """Turn a planned path into (frame, key) presses for driving the game."""
+    names = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+    return [(frame, names[(row - prev_row, col - prev_col)])
+            for (_, prev_row, prev_col), (frame, row, col) in zip(path, path[1:])
+            if (row, col) != (prev_row, prev_col)]
+
+
+# ---------- Sweep ----------
+def difficulty_ramp(goals):
+    """The multipliers the game reaches after 0..goals goals (same float additions as the game)."""
+    values = [1.0]
+    for _ in range(goals):
+        values.append(values[-1] + DIFFICULTY_STEP)
+    return values
+
+def run_chunk(lanes, difficulty, start_frames, move_every, horizon):
+    """Worker entry point: plan one crossing per start frame; returns frames taken or None."""
+    planner = CrossingPlanner(lanes, difficulty, move_every)
+    results = []
+    for start_frame in start_frames:
+        path = planner.plan(start_frame, horizon=horizon)
+        results.append(None if path is None else path[-1][0] - start_frame)
+    return results
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+def summarize(difficulty, results):
+    frames = sorted(r for r in results if r is not None)
+    return {
+        "difficulty": difficulty,
+        "crossings": len(results),
+        "solvable_rate": len(frames) / len(results) if results else 0.0,
+        "mean_seconds": sum(frames) / len(frames) / FPS if frames else None,
+        "p10_seconds": percentile(frames, 10) / FPS,
+        "p50_seconds": percentile(frames, 50) / FPS,
+        "p90_seconds": percentile(frames, 90) / FPS,
+    }
+
+def sweep(difficulties, crossings, move_every=6, horizon=30 * FPS, workers=None, seed=0, lanes=DEFAULT_LANES):
+    """Plan `crossings` crossings from random start frames at every difficulty, over a process pool."""
+    tasks = []
+    for i, difficulty in enumerate(difficulties):
+        for start in range(0, crossings, CHUNK_CROSSINGS):
+            rng = random.Random(seed + i * 1_000_003 + start)
+            n = min(CHUNK_CROSSINGS, crossings - start)
+            tasks.append((i, difficulty, [rng.randrange(START_WINDOW) for _ in range(n)]))
+
+    results = [[] for _ in difficulties]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(i, pool.submit(run_chunk, lanes, difficulty, starts, move_every, horizon))
+                   for i, difficulty, starts in tasks]
+        for i, future in futures:
+            results[i].extend(future.result())
+    return [summarize(d, r) for d, r in zip(difficulties, results)]
+
+
+# ---------- CLI ----------
+def main():
+    parser = argparse.ArgumentParser(description="Path-planning bot and difficulty sweep for GnomeFrogger")
+    parser.add_argument("--goals", type=int, default=20,
+                        help="sweep the game's ramp from 0 up to this many goals")
+    parser.add_argument("--difficulty", help="comma-separated multipliers to test instead of the ramp")
+    parser.add_argument("--crossings", type=int, default=2000, help="crossings per difficulty")
+    parser.add_argument("--move-every", type=int, default=6, help="frames between the bot's key presses")
+    parser.add_argument("--horizon-seconds", type=float, default=30.0,
+                        help="give up on a crossing after this much game time")
+    parser.add_argument("--pack", help="plan against a level pack (see frogger_levels.py) instead of the built-in lanes")
+    parser.add_argument("--level", type=int, default=1, help="which level of --pack (1 = first)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.difficulty:
+        difficulties = [float(v) for v in args.difficulty.split(",") if v.strip()]
+    else:
+        difficulties = difficulty_ramp(args.goals)
+    horizon = int(args.horizon_seconds * FPS)
+
+    began = time.perf_counter()
+    lanes = DEFAULT_LANES
+    if args.pack:
+        from frogger_levels import LevelError, load_pack
+        try:
+            pack = load_pack(args.pack)
+        except (OSError, LevelError) as e:
+            raise SystemExit(f"Could not load {args.pack}: {e}")
+        lanes = pack.levels[(args.level - 1) % len(pack.levels)].lanes()
+
+    summaries = sweep(difficulties, args.crossings, args.move_every, horizon, args.workers, args.seed, lanes)
+    elapsed = time.perf_counter() - began
+
+    for s in summaries:
+        timing = (f"mean {s['mean_seconds']:5.2f}s   p10/p50/p90 "
+                  f"{s['p10_seconds']:.2f}/{s['p50_seconds']:.2f}/{s['p90_seconds']:.2f}s"
+                  if s["mean_seconds"] is not None else "no safe crossing found")
+        print(f"difficulty {s['difficulty']:4.2f}   solvable {s['solvable_rate'] * 100:5.1f}%   {timing}")
+
+    game_seconds = sum((s["mean_seconds"] or 0) * s["crossings"] * s["solvable_rate"] for s in summaries)
+    print(f"{len(difficulties) * args.crossings} crossings ({game_seconds:.0f}s of play) in {elapsed:.1f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+if __name__ == "__main__":
+    main()
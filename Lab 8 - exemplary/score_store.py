@@ -0,0 +1,186 @@
+# score_store.py — local high-score store for the Lab 8 games
+
+"""A small persistent leaderboard that never blocks the game loop.
+
+Scores are appended to a JSON-lines log, one record per finished session:
+    {"player": "sam", "score": 42, "timestamp": 1760000000.0, "game": "cookie_clicker_challenge"}
+
+- A background writer thread loads the log, appends new records and fsyncs them.
+  add() only updates memory and queues the record, so it is safe to call every frame.
+- Writes are fsynced whenever the queue drains (and at least every `fsync_every` records
+  under load). A crash can lose at most the records still queued; a half-written last
+  line is skipped when the log is loaded.
+- Once the log passes `compact_after` lines it is rewritten keeping the best `keep`
+  records per game (temp file + os.replace, so the old log survives a crash mid-way).
+- The top `top_n` scores for this game are kept in a heap, so top() is instant.
+
+Usage:
+    store = ScoreStore("scores.jsonl", game="my_game")
+    store.add(score)
+    store.top()    # [(score, player, timestamp), ...] best first
+    store.close()  # on exit: flush and fsync anything still queued
+"""
+
+import getpass
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+
+def default_player():
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "player"
+
+
+def normalize_record(line):
+    """One log line -> a record with an int score, float timestamp and str player, or None."""
+    try:
+        record = json.loads(line)
+        return {
+            "player": str(record.get("player", "player")),
+            "score": int(record["score"]),
+            "timestamp": float(record.get("timestamp", 0.0)),
+            "game": record.get("game"),
+        }
+    except (ValueError, KeyError, TypeError, AttributeError, OverflowError):
+        return None  # torn, foreign or hand-edited line
+
+
+class ScoreStore:
+    def __init__(self, path, game, top_n=10, fsync_every=20, compact_after=5000, keep=500):
+        self.path = Path(path)
+        self.game = game
+        self.top_n = top_n
+        self.fsync_every = fsync_every
+        self.compact_after = compact_after
+        self.keep = keep
+        self.player = default_player()
+
+        self.loaded = threading.Event()   # set once the existing log has been read
+        self._top = []                    # min-heap of (score, timestamp, player)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self._writer.start()
+
+    # ---------- Game-side API (never touches the disk) ----------
+    def add(self, score, player=None):
+        record = {
+            "player": player or self.player,
+            "score": int(score),
+            "timestamp": time.time(),
+            "game": self.game,
+        }
+        self._index(record)
+        self._queue.put(record)
+
+    def top(self, n=None):
+        """Best scores first, as (score, player, timestamp); empty until the log has loaded."""
+        with self._lock:
+            best = sorted(self._top, reverse=True)
+        return [(score, player, ts) for score, ts, player in best[:n or self.top_n]]
+
+    def best(self):
+        with self._lock:
+            return max(self._top)[0] if self._top else 0
+
+    def close(self, timeout=2.0):
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    # ---------- In-memory index ----------
+    def _index(self, record):
+        if record.get("game") != self.game:
+            return
+        entry = (record["score"], record["timestamp"], record["player"])
+        with self._lock:
+            if len(self._top) < self.top_n:
+                heapq.heappush(self._top, entry)
+            elif entry > self._top[0]:
+                heapq.heapreplace(self._top, entry)
+
+    # ---------- Writer thread ----------
+    def _read_log(self):
+        records = []
+        try:
+            # errors="replace": a damaged byte only spoils its own line
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    record = normalize_record(line)
+                    if record is not None:
+                        records.append(record)
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _compact(self):
+        """Rewrite the log keeping the best `keep` records of every game."""
+        by_game = {}
+        for record in self._read_log():
+            by_game.setdefault(record.get("game"), []).append(record)
+        kept = []
+        for records in by_game.values():
+            kept.extend(heapq.nlargest(self.keep, records, key=lambda r: r["score"]))
+        kept.sort(key=lambda r: r.get("timestamp", 0))
+
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for record in kept:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        return len(kept)
+
+    def _open_for_append(self):
+        f = open(self.path, "a", encoding="utf-8")
+        if f.tell() > 0:
+            with open(self.path, "rb") as tail:
+                tail.seek(-1, os.SEEK_END)
+                if tail.read(1) != b"\n":
+                    f.write("\n")  # end a torn last line so the next record stays readable
+        return f
+
+    def _run(self):
+        try:
+            records = self._read_log()
+        except OSError as e:
+            print(f"Could not load scores from '{self.path}': {e}")
+            records = []
+        for record in records:
+            self._index(record)
+        self.loaded.set()   # even after a failed load, so the game and new scores keep going
+        lines = len(records)
+
+        f = None
+        unsynced = 0
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    break
+                if f is None:
+                    f = self._open_for_append()
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                unsynced += 1
+                lines += 1
+                if unsynced >= self.fsync_every or self._queue.empty():
+                    os.fsync(f.fileno())
+                    unsynced = 0
+                if lines >= self.compact_after:
+                    f.close()
+                    f = None
+                    lines = self._compact()
+            except OSError as e:
+                print(f"Could not save score to '{self.path}': {e}")
+        if f is not None:
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()